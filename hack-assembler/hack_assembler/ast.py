@@ -1,4 +1,3 @@
-from abc import ABC
 from enum import Enum
 from hack_assembler.tokens import Token
 
@@ -10,13 +9,16 @@ class AstNodeType(Enum):
     SYMBOL_DECLARATION = 'SYMBOL_DECLARATION'
 
 
-class AstNode(ABC):
+class AstNode(object):
+    __slots__ = ('type',)
+
     def __init__(self, type: AstNodeType) -> None:
-        super().__init__()
         self.type = type
 
 
 class ProgramNode(AstNode):
+    __slots__ = ('instructions',)
+
     def __init__(self, instructions: list[AstNode]) -> None:
         super().__init__(type=AstNodeType.PROGRAM)
         self.instructions = instructions
@@ -29,6 +31,8 @@ class ProgramNode(AstNode):
 
 
 class AInstructionNode(AstNode):
+    __slots__ = ('token',)
+
     def __init__(self, token: Token) -> None:
         super().__init__(type=AstNodeType.A_INSTRUCTION)
         self.token = token
@@ -38,6 +42,8 @@ class AInstructionNode(AstNode):
 
 
 class CInstructionNode(AstNode):
+    __slots__ = ('dest', 'comp', 'jump')
+
     def __init__(self,
                  comp: Token,
                  dest: Token | None = None,
@@ -52,6 +58,8 @@ class CInstructionNode(AstNode):
 
 
 class SymbolDeclarationNode(AstNode):
+    __slots__ = ('token',)
+
     def __init__(self, token: Token) -> None:
         super().__init__(type=AstNodeType.SYMBOL_DECLARATION)
         self.token = token
@@ -0,0 +1,139 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, Future, as_completed
+from pathlib import Path
+from hack_assembler.pipeline import OUTPUT_EXTENSIONS, add_assembly_arguments, assemble_file, cache_from_args
+from hack_assembler.cache import BuildCache
+from hack_assembler.rom_image import ByteOrder
+from hack_assembler.watch import Watcher, add_watch_arguments
+
+
+def discover_sources(directory: Path) -> list[Path]:
+    """
+    Find every `.asm` file under **directory**, in a deterministic order
+    """
+    return sorted(p for p in directory.rglob('*.asm') if p.is_file())
+
+
+def output_path_for(source: Path, directory: Path, output_directory: Path | None, format: str) -> Path:
+    target = source if output_directory is None else output_directory / source.relative_to(directory)
+    return target.with_suffix(OUTPUT_EXTENSIONS[format])
+
+
+def _assemble_job(input_file_path: Path,
+                  output_file_path: Path,
+                  lexer: str,
+                  fast: bool,
+                  single_pass: bool,
+                  format: str,
+                  byteorder: ByteOrder,
+                  cache: BuildCache | None) -> tuple[float, str | None]:
+    """
+    Assemble one file in a worker process.
+
+    Returns the elapsed time and the error message if assembling failed.
+    """
+    start = time.perf_counter()
+    try:
+        output_file_path.parent.mkdir(parents=True, exist_ok=True)
+        assemble_file(input_file_path,
+                      output_file_path,
+                      lexer=lexer,
+                      fast=fast,
+                      single_pass=single_pass,
+                      format=format,
+                      byteorder=byteorder,
+                      cache=cache)
+    except Exception as e:
+        return time.perf_counter() - start, f'{type(e).__name__}: {e}'
+    return time.perf_counter() - start, None
+
+
+def build(directory: Path,
+          jobs: int | None = None,
+          output_directory: Path | None = None,
+          lexer: str = 'regex',
+          fast: bool = False,
+          single_pass: bool = False,
+          format: str = 'text',
+          byteorder: ByteOrder = 'little',
+          cache: BuildCache | None = None) -> int:
+    """
+    Assemble every `.asm` file under **directory** across a pool of worker
+    processes, reporting each file as soon as it is done.
+
+    Returns the number of files that failed.
+    """
+    sources = discover_sources(directory)
+    if not sources:
+        print(f'No .asm file found in {directory}', file=sys.stderr)
+        return 0
+
+    start = time.perf_counter()
+    failures = 0
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures: dict[Future[tuple[float, str | None]], Path] = {
+            executor.submit(_assemble_job,
+                            source,
+                            output_path_for(source, directory, output_directory, format),
+                            lexer,
+                            fast,
+                            single_pass,
+                            format,
+                            byteorder,
+                            cache): source
+            for source in sources
+        }
+        for future in as_completed(futures):
+            source = futures[future]
+            elapsed, error = future.result()
+            if error is None:
+                print(f'[{elapsed * 1000:9.2f} ms] {source}', flush=True)
+            else:
+                failures += 1
+                print(f'[{elapsed * 1000:9.2f} ms] {source} FAILED {error}', file=sys.stderr, flush=True)
+
+    print(f'{len(sources) - failures}/{len(sources)} files assembled in {time.perf_counter() - start:.2f} s')
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='hack_assembler.main build',
+        description="Assemble every .asm file of a directory in parallel.")
+    parser.add_argument("directory", help="Directory searched recursively for .asm files")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(),
+                        help="Number of worker processes (default: number of CPUs)")
+    parser.add_argument("--output-dir",
+                        help="Directory receiving the outputs, mirroring the source tree (default: next to each source)")
+    add_assembly_arguments(parser)
+    add_watch_arguments(parser)
+    args = parser.parse_args(argv)
+
+    directory = Path(args.directory)
+    output_directory = Path(args.output_dir) if args.output_dir is not None else None
+    if args.watch:
+        targets: list[tuple[Path, Path]] = []
+        for source in discover_sources(directory):
+            target = output_path_for(source, directory, output_directory, args.format)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            targets.append((source, target))
+
+        Watcher(targets=targets,
+                format=args.format,
+                byteorder=args.byteorder,
+                interval=args.interval).run()
+        return 0
+
+    failures = build(directory,
+                     jobs=args.jobs,
+                     output_directory=output_directory,
+                     lexer=args.lexer,
+                     fast=args.fast,
+                     single_pass=args.single_pass,
+                     format=args.format,
+                     byteorder=args.byteorder,
+                     cache=cache_from_args(args))
+    return 1 if failures else 0
@@ -0,0 +1,40 @@
+import argparse
+import io
+import time
+from array import array
+from pathlib import Path
+from hack_assembler.benchmark.synthetic import synthetic_program
+from hack_assembler.disassembler import Disassembler, load_words, word_table
+from hack_assembler.pipeline import assemble
+from hack_assembler.writer import write_machine_codes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure the throughput of the Hack disassembler.")
+    parser.add_argument("inputs", nargs='*',
+                        default=['../projects/06/Pong.hack'],
+                        help="Paths to .hack or .bin input files")
+    parser.add_argument("--synthetic", default='1000000',
+                        help="Comma-separated instruction counts of generated programs, empty to skip")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    word_table()
+    print(f'word table built in {(time.perf_counter() - start) * 1000:.2f} ms')
+
+    inputs: list[tuple[str, array]] = [(p, load_words(Path(p))) for p in args.inputs]
+    for size in filter(None, args.synthetic.split(',')):
+        inputs.append((f'synthetic-{int(size)}', array('H', assemble(synthetic_program(int(size))))))
+
+    for name, words in inputs:
+        print(f'{name} ({len(words)} words, {2 * len(words) / (1024 * 1024):.2f} MB)')
+        for labels in [False, True]:
+            start = time.perf_counter()
+            write_machine_codes(Disassembler(words=words, labels=labels).generate_instructions(), io.StringIO())
+            seconds = max(time.perf_counter() - start, 1e-9)
+            print(f'    {"labels" if labels else "plain":<7} {seconds * 1000:10.2f} ms  {len(words) / seconds:12.0f} words/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import time
+from pathlib import Path
+from hack_assembler.lexer import Lexer
+from hack_assembler.regex_lexer import RegexLexer
+from hack_assembler.tokens import Token, TokenType
+
+LEXERS: dict[str, type[Lexer] | type[RegexLexer]] = {
+    'char': Lexer,
+    'regex': RegexLexer,
+}
+
+
+def tokenize(lexer: Lexer | RegexLexer) -> list[Token]:
+    tokens: list[Token] = []
+    token = lexer.get_next_token()
+    while token.type != TokenType.EOF:
+        tokens.append(token)
+        token = lexer.get_next_token()
+    tokens.append(token)
+    return tokens
+
+
+def _token_key(token: Token) -> tuple:
+    return (token.type, token.value, token.line, token.column)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare throughput of the Hack assembly lexers.")
+    parser.add_argument("inputs", nargs='*',
+                        default=['../projects/06/Pong.asm'],
+                        help="Paths to input files")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Number of runs per lexer, the best one is reported")
+    args = parser.parse_args()
+
+    for input_file_path in args.inputs:
+        text = Path(input_file_path).read_text()
+        size_mb = len(text.encode()) / (1024 * 1024)
+
+        print(f'{input_file_path} ({len(text.encode())} bytes)')
+        streams: dict[str, list[Token]] = {}
+        for name, lexer_cls in LEXERS.items():
+            best = float('inf')
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                streams[name] = tokenize(lexer_cls(text=text))
+                best = min(best, time.perf_counter() - start)
+
+            print(f'    {name:<6} {best * 1000:9.2f} ms  {size_mb / best:7.2f} MB/s  '
+                  f'{len(streams[name]) / best:12.0f} tokens/s')
+
+        reference = list(map(_token_key, streams['char']))
+        for name, tokens in streams.items():
+            if list(map(_token_key, tokens)) != reference:
+                print(f'    {name} token stream differs from the `char` lexer')
+
+
+if __name__ == '__main__':
+    main()
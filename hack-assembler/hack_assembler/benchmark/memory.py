@@ -0,0 +1,60 @@
+import argparse
+import gc
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from hack_assembler.benchmark.lexer import LEXERS, tokenize
+from hack_assembler.benchmark.synthetic import synthetic_program
+from hack_assembler.parser import Parser
+
+
+def retained_memory(fn: Callable[[], Any]) -> tuple[Any, int]:
+    """
+    Run **fn** and return its result along with the memory still held by
+    that result once it returned (tracemalloc, garbage collected first).
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure the memory held by tokens and AST nodes of the Hack assembler.")
+    parser.add_argument("inputs", nargs='*',
+                        default=['../projects/06/Pong.asm'],
+                        help="Paths to input files")
+    parser.add_argument("--synthetic", default='100000',
+                        help="Comma-separated instruction counts of generated programs, empty to skip")
+    parser.add_argument("--lexer", choices=list(LEXERS), default='regex',
+                        help="Tokenizer engine")
+    args = parser.parse_args()
+
+    inputs: list[tuple[str, str]] = [(p, Path(p).read_text()) for p in args.inputs]
+    for size in filter(None, args.synthetic.split(',')):
+        inputs.append((f'synthetic-{int(size)}', synthetic_program(int(size))))
+
+    lexer_cls = LEXERS[args.lexer]
+    for name, text in inputs:
+        tokens, tokens_size = retained_memory(lambda: tokenize(lexer_cls(text=text)))
+        token_count = len(tokens)
+        del tokens
+
+        ast, ast_size = retained_memory(lambda: Parser(lexer=lexer_cls(text=text)).parse())
+        instructions = max(len(ast.instructions), 1)
+        del ast
+
+        print(f'{name}')
+        print(f'    tokens {token_count:9d}  {tokens_size / (1024 * 1024):8.2f} MB  '
+              f'{tokens_size / max(token_count, 1):6.1f} B/token  {tokens_size / instructions:6.1f} B/instr')
+        print(f'    ast    {instructions:9d}  {ast_size / (1024 * 1024):8.2f} MB  '
+              f'{ast_size / instructions:6.1f} B/instr')
+
+
+if __name__ == '__main__':
+    main()
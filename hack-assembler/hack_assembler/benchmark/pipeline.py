@@ -0,0 +1,165 @@
+import argparse
+import cProfile
+import gc
+import pstats
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from hack_assembler.benchmark.lexer import LEXERS, tokenize
+from hack_assembler.benchmark.synthetic import synthetic_program
+from hack_assembler.code_generator import CodeGenerator
+from hack_assembler.fast_assembler import FastAssembler
+from hack_assembler.parser import Parser
+from hack_assembler.semantic_analyzer import SemanticAnalyzer
+from hack_assembler.single_pass import SinglePassAssembler
+from hack_assembler.tokens import Token
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+DEFAULT_INPUT_PATTERNS = [
+    'projects/06/*.asm',
+    'practices/hack-asm/*.asm',
+]
+"""Glob patterns relative to the repository root"""
+
+
+class _ReplayLexer(object):
+    """
+    Hand out already produced tokens, so that the parser is measured without lexing
+    """
+
+    def __init__(self, tokens: list[Token]):
+        self._tokens = iter(tokens)
+        self._last: Token | None = None
+
+    def get_next_token(self) -> Token:
+        self._last = next(self._tokens, self._last)
+        return self._last
+
+
+class PhaseResult(object):
+    def __init__(self, name: str, seconds: float, peak_memory: int | None):
+        self.name = name
+        self.seconds = seconds
+        self.peak_memory = peak_memory
+
+
+def _measure(fn: Callable[[], Any], memory: bool) -> tuple[Any, float, int | None]:
+    """
+    Run **fn** once and return its result, elapsed time and, if **memory**
+    is set, the peak of memory allocated while it ran (tracemalloc).
+    """
+    gc.collect()
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak: int | None = None
+    if memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run_phases(text: str, lexer: str = 'regex', memory: bool = False) -> tuple[list[PhaseResult], int, int]:
+    """
+    Run lexer, parser, semantic analyzer and code generator one after
+    another over **text**, plus the line-oriented fast assembler and the
+    single-pass assembler for comparison.
+
+    Returns the result of each phase, the number of tokens and the number of instructions.
+    """
+    results: list[PhaseResult] = []
+
+    tokens, seconds, peak = _measure(lambda: tokenize(LEXERS[lexer](text=text)), memory)
+    results.append(PhaseResult('lexer', seconds, peak))
+
+    ast, seconds, peak = _measure(lambda: Parser(lexer=_ReplayLexer(tokens)).parse(), memory)
+    results.append(PhaseResult('parser', seconds, peak))
+    token_count = len(tokens)
+    del tokens
+
+    symbol_table, seconds, peak = _measure(lambda: SemanticAnalyzer(ast=ast).analyze(), memory)
+    results.append(PhaseResult('semantic', seconds, peak))
+
+    words, seconds, peak = _measure(
+        lambda: list(CodeGenerator(ast=ast, symbol_table=symbol_table).generate_words()), memory)
+    results.append(PhaseResult('codegen', seconds, peak))
+
+    _, seconds, peak = _measure(lambda: FastAssembler(text=text).generate_words(), memory)
+    results.append(PhaseResult('fast', seconds, peak))
+
+    _, seconds, peak = _measure(lambda: SinglePassAssembler(text=text, lexer=lexer).generate_words(), memory)
+    results.append(PhaseResult('single', seconds, peak))
+
+    return results, token_count, len(words)
+
+
+def _report(name: str, text: str, lexer: str, memory: bool) -> None:
+    size = len(text.encode())
+    print(f'{name} ({size} bytes)')
+    try:
+        results, tokens, instructions = run_phases(text, lexer=lexer)
+        peaks: list[int | None] = [None] * len(results)
+        if memory:
+            peaks = [r.peak_memory for r in run_phases(text, lexer=lexer, memory=True)[0]]
+    except Exception as e:
+        print(f'    FAILED {type(e).__name__}: {e}')
+        return
+
+    for result, peak in zip(results, peaks):
+        seconds = max(result.seconds, 1e-9)
+        line = (f'    {result.name:<9} {result.seconds * 1000:10.2f} ms'
+                f'  {instructions / seconds:12.0f} instr/s')
+        if result.name == 'lexer':
+            line += f'  {tokens / seconds:12.0f} tokens/s  {size / (1024 * 1024) / seconds:6.2f} MB/s'
+        if peak is not None:
+            line += f'  peak {peak / (1024 * 1024):8.2f} MB ({peak / max(instructions, 1):6.0f} B/instr)'
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark each phase of the Hack assembler pipeline.")
+    parser.add_argument("inputs", nargs='*',
+                        help="Paths to input files (default: projects/06 and practices/hack-asm programs)")
+    parser.add_argument("--synthetic", default='10000,100000,1000000',
+                        help="Comma-separated instruction counts of generated programs, empty to skip")
+    parser.add_argument("--lexer", choices=list(LEXERS), default='regex',
+                        help="Tokenizer engine used for the lexer phase")
+    parser.add_argument("--memory", action='store_true',
+                        help="Also report the peak memory of each phase (tracemalloc, in a separate slower run)")
+    parser.add_argument("--profile", metavar='PATH',
+                        help="Run the whole benchmark under cProfile and dump pstats to PATH")
+    parser.add_argument("--top", type=int, default=25,
+                        help="Number of functions printed from the profile")
+    args = parser.parse_args()
+
+    inputs: list[tuple[str, str]] = []
+    if args.inputs:
+        paths = [Path(p) for p in args.inputs]
+    else:
+        paths = sorted(p for pattern in DEFAULT_INPUT_PATTERNS for p in REPO_ROOT.glob(pattern))
+    for path in paths:
+        inputs.append((str(path), path.read_text()))
+    for size in filter(None, args.synthetic.split(',')):
+        inputs.append((f'synthetic-{int(size)}', synthetic_program(int(size))))
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler is not None:
+        profiler.enable()
+
+    for name, text in inputs:
+        _report(name, text, lexer=args.lexer, memory=args.memory)
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        pstats.Stats(args.profile).sort_stats('tottime').print_stats(args.top)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+import random
+from hack_assembler.constants import DEST_MNEMONICS, COMP_MNEMONICS, JUMP_MNEMONICS
+
+
+def synthetic_program(instructions: int, seed: int = 0) -> str:
+    """
+    Generate a valid Hack assembly program of exactly **instructions**
+    instructions, mixing labels, variables, constants and C instructions
+    in proportions close to compiled programs such as Pong.asm.
+
+    Programs bigger than the 32K ROM are still valid input for the
+    assembler as long as labels stay addressable, so every label is
+    declared within the first 32000 instructions.
+    """
+    rng = random.Random(seed)
+    lines: list[str] = ['// Synthetic benchmark program']
+    labels = max(1, min(instructions, 32000) // 50)
+    label_spacing = max(1, min(instructions, 32000) // labels)
+    variables = max(1, instructions // 200)
+
+    for i in range(instructions):
+        if i % label_spacing == 0 and i // label_spacing < labels:
+            lines.append(f'(LABEL_{i // label_spacing})')
+
+        r = rng.random()
+        if r < 0.15:
+            lines.append(f'@{rng.randrange(32768)}')
+        elif r < 0.30:
+            lines.append(f'@var_{rng.randrange(variables)}')
+        elif r < 0.40:
+            lines.append(f'@LABEL_{rng.randrange(labels)}')
+        elif r < 0.45:
+            lines.append(f'@{rng.choice(['SP', 'LCL', 'ARG', 'THIS', 'THAT', 'R13', 'SCREEN'])}')
+        elif r < 0.55:
+            lines.append(f'{rng.choice(COMP_MNEMONICS)};{rng.choice(JUMP_MNEMONICS)}')
+        else:
+            lines.append(f'{rng.choice(DEST_MNEMONICS)}={rng.choice(COMP_MNEMONICS)}')
+
+        if i % 1000 == 999:
+            lines.append('')
+            lines.append(f'// block {i // 1000}')
+
+    return '\n'.join(lines)
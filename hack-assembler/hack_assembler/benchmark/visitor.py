@@ -0,0 +1,74 @@
+import argparse
+import time
+from collections.abc import Iterable, Iterator
+from hack_assembler.ast import AstNode
+from hack_assembler.benchmark.synthetic import synthetic_program
+from hack_assembler.code_generator import CodeGenerator
+from hack_assembler.parser import Parser
+from hack_assembler.regex_lexer import RegexLexer
+from hack_assembler.semantic_analyzer import SemanticAnalyzer
+
+
+class _GetattrDispatch(object):
+    """
+    Per-node dispatch building the method name and looking it up on every
+    visit, as `NodeVisitor` used to do
+    """
+
+    def _visit(self, node: AstNode):
+        visitor = getattr(self, f'_visit_{type(node).__name__}', self._generic_visit)
+        return visitor(node)
+
+    def _visit_all(self, nodes: Iterable[AstNode]) -> Iterator:
+        for node in nodes:
+            yield self._visit(node)
+
+
+class _GetattrSemanticAnalyzer(_GetattrDispatch, SemanticAnalyzer):
+    pass
+
+
+class _GetattrCodeGenerator(_GetattrDispatch, CodeGenerator):
+    pass
+
+
+VISITORS = {
+    'getattr': (_GetattrSemanticAnalyzer, _GetattrCodeGenerator),
+    'cached': (SemanticAnalyzer, CodeGenerator),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare node dispatch strategies of the semantic analyzer and code generator.")
+    parser.add_argument("--instructions", type=int, default=1000000,
+                        help="Number of instructions of the generated program")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Number of runs per strategy, the best one is reported")
+    args = parser.parse_args()
+
+    ast = Parser(lexer=RegexLexer(text=synthetic_program(args.instructions))).parse()
+    nodes = len(ast.instructions)
+    print(f'synthetic-{args.instructions} ({nodes} nodes)')
+
+    outputs: dict[str, list[int]] = {}
+    for name, (analyzer_cls, generator_cls) in VISITORS.items():
+        best_semantic = best_codegen = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            symbol_table = analyzer_cls(ast=ast).analyze()
+            best_semantic = min(best_semantic, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            outputs[name] = list(generator_cls(ast=ast, symbol_table=symbol_table).generate_words())
+            best_codegen = min(best_codegen, time.perf_counter() - start)
+
+        print(f'    {name:<8} semantic {best_semantic * 1000:9.2f} ms  {nodes / best_semantic:12.0f} nodes/s  '
+              f'codegen {best_codegen * 1000:9.2f} ms  {nodes / best_codegen:12.0f} nodes/s')
+
+    if outputs['getattr'] != outputs['cached']:
+        print('    outputs differ between dispatch strategies')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+import functools
+import hashlib
+import os
+import sys
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+import hack_assembler
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+"""Default size limit of the cache directory, in bytes"""
+
+CACHE_ENVIRONMENT_VARIABLE = 'HACK_ASSEMBLER_CACHE'
+"""Enables the build cache when set to a non-empty value other than `0`"""
+
+_ENTRY_SUFFIX = '.words'
+
+
+def default_cache_directory() -> Path:
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'hack-assembler'
+
+
+@functools.cache
+def assembler_fingerprint() -> bytes:
+    """
+    Identify the assembler producing the cached words: its version and
+    the content of its own source files, so any code change invalidates
+    the cache even without a version bump.
+    """
+    digest = hashlib.sha256(hack_assembler.__version__.encode())
+    for source in sorted(Path(hack_assembler.__file__).parent.rglob('*.py')):
+        digest.update(source.read_bytes())
+    return digest.digest()
+
+
+class BuildCache(object):
+    """
+    On-disk cache of assembled machine words keyed by a hash of the
+    assembly source and of the assembler itself.
+
+    Each entry is a file of little-endian 16-bit words. A hit refreshes
+    the entry's modification time, and storing an entry evicts the least
+    recently used ones until the directory fits in **max_size** bytes.
+    """
+
+    def __init__(self, directory: Path | None = None, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = directory if directory is not None else default_cache_directory()
+        self.max_size = max_size
+
+    def key(self, asm_code: str) -> str:
+        digest = hashlib.sha256(assembler_fingerprint())
+        digest.update(asm_code.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> array | None:
+        path = self._entry_path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+
+        words = array('H')
+        words.frombytes(data)
+        if sys.byteorder != 'little':
+            words.byteswap()
+        return words
+
+    def put(self, key: str, words: Iterable[int]) -> None:
+        data = array('H', words)
+        if sys.byteorder != 'little':
+            data.byteswap()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(key)
+        # Write then rename, so concurrent builds never read a partial entry
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        tmp_path.write_bytes(data.tobytes())
+        os.replace(tmp_path, path)
+
+        self._evict()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f'{key}{_ENTRY_SUFFIX}'
+
+    def _evict(self) -> None:
+        entries: list[tuple[float, int, str]] = []
+        total_size = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(_ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
@@ -0,0 +1,112 @@
+from array import array
+from hack_assembler.encoding import word_to_text
+from hack_assembler.errors import DuplicatedSymbolError
+from hack_assembler.fixups import encode_instructions, patch_fixups
+from hack_assembler.parser import Parser
+from hack_assembler.regex_lexer import RegexLexer
+from hack_assembler.symbol_table import SymbolTable, DeclaredSymbol
+
+
+class ChunkResult(object):
+    """
+    Machine words of one chunk of the input, with every symbol left to
+    resolve. Addresses are relative to the first word of the chunk.
+    """
+
+    def __init__(self,
+                 words: array,
+                 labels: list[tuple[str, int]],
+                 fixups: list[tuple[int, str]]):
+        self.words = words
+        self.labels = labels
+        """Name and address of every label declared in the chunk"""
+        self.fixups = fixups
+        """Address of every placeholder word and the symbol it references"""
+
+
+def split_lines(text: str, chunks: int) -> list[tuple[str, int]]:
+    """
+    Split **text** at line boundaries into at most **chunks** pieces of
+    about the same size, along with the number of their first line
+    """
+    pieces: list[tuple[str, int]] = []
+    size = len(text)
+    start = 0
+    line = 1
+    for i in range(1, chunks + 1):
+        if start >= size:
+            break
+        end = text.find('\n', max(start, size * i // chunks)) + 1 if i < chunks else size
+        if end <= 0:
+            end = size
+        pieces.append((text[start:end], line))
+        line += text.count('\n', start, end)
+        start = end
+    return pieces
+
+
+def assemble_chunk(text: str, line: int) -> ChunkResult:
+    """
+    Lex, parse and encode one chunk in a worker process. Only predefined
+    symbols are resolved: labels may be declared in any other chunk.
+    """
+    words = array('H')
+    labels: list[tuple[str, int]] = []
+    fixups: list[tuple[int, str]] = []
+    encode_instructions(Parser(lexer=RegexLexer(text=text, line=line)).iter_instructions(),
+                        symbol_table=SymbolTable(),
+                        words=words,
+                        fixups=fixups,
+                        declare_label=lambda name, address: labels.append((name, address)))
+    return ChunkResult(words=words, labels=labels, fixups=fixups)
+
+
+class ChunkedAssembler(object):
+    """
+    Assemble a single large Hack assembly file across worker processes.
+
+    The input is split at line boundaries and each chunk is encoded on
+    its own, leaving labels and variables unresolved. Chunks are then
+    laid out in source order: their labels are shifted by the address of
+    the first word of the chunk, and their fixups are patched in ROM
+    order, so that variables get the same addresses as with the
+    sequential `SymbolTable` allocation.
+    """
+
+    def __init__(self, text: str, chunks: int, jobs: int | None = None):
+        self._text = text
+        self._chunks = chunks
+        self._jobs = jobs
+        self._symbol_table = SymbolTable()
+
+    def assemble(self) -> str:
+        return '\n'.join(self.generate_machine_codes())
+
+    def generate_machine_codes(self) -> list[str]:
+        return list(map(word_to_text, self.generate_words()))
+
+    def generate_words(self) -> array:
+        pieces = split_lines(self._text, self._chunks)
+        if len(pieces) <= 1:
+            results = [assemble_chunk(text, line) for text, line in pieces]
+        else:
+            # Imported on demand: the process pool machinery is slow to import
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=self._jobs or len(pieces)) as executor:
+                results = list(executor.map(assemble_chunk,
+                                            [text for text, _ in pieces],
+                                            [line for _, line in pieces]))
+
+        words = array('H')
+        fixups: list[tuple[int, str]] = []
+        for result in results:
+            base = len(words)
+            for name, address in result.labels:
+                if self._symbol_table.lookup(name) is not None:
+                    raise DuplicatedSymbolError(name)
+                self._symbol_table.define(DeclaredSymbol(name=name, value=base + address))
+            fixups.extend((base + address, name) for address, name in result.fixups)
+            words.extend(result.words)
+
+        patch_fixups(words, fixups, self._symbol_table)
+        return words
@@ -1,7 +1,8 @@
+from collections.abc import Iterator
 from hack_assembler.ast_visitor import NodeVisitor
 from hack_assembler.ast import ProgramNode, AInstructionNode, CInstructionNode, SymbolDeclarationNode
-from hack_assembler.symbol_table import SymbolTable, DeclaredSymbol, Symbol
-from hack_assembler.constants import DEST_MNEMONICS_TABLE, COMP_MNEMONICS_TABLE, JUMP_MNEMONICS_TABLE
+from hack_assembler.symbol_table import SymbolTable
+from hack_assembler.encoding import encode_a_instruction, encode_c_instruction, word_to_text
 from hack_assembler.tokens import TokenType
 
 
@@ -15,40 +16,37 @@ class CodeGenerator(NodeVisitor):
 
         self._ast = ast
         self._symbol_table = symbol_table
-        self._allocatable_mem_ptr = 16
 
     def generate_binary_code(self) -> str:
         return self._visit(self._ast)
 
-    def _visit_ProgramNode(self, node: ProgramNode) -> str:
-        machine_codes = ''
-        for instruction in node.instructions:
-            c = self._visit(instruction)
-            if c is not None:
-                machine_codes += f'\n{c}'
-        return machine_codes.strip()
-
-    def _visit_AInstructionNode(self, node: AInstructionNode) -> str:
-        return f'0{(self._resolve_symbol_to_value(node.token.value) if node.token.type == TokenType.SYMBOL else node.token.value):015b}'
+    def generate_machine_codes(self) -> Iterator[str]:
+        """
+        Lazily yield the machine code of each instruction, one word at a time
+        """
+        return map(word_to_text, self.generate_words())
 
-    def _visit_CInstructionNode(self, node: CInstructionNode) -> str:
-        return f'111{COMP_MNEMONICS_TABLE[node.comp.value]}{DEST_MNEMONICS_TABLE[node.dest.value if node.dest is not None else None]}{JUMP_MNEMONICS_TABLE[node.jump.value if node.jump is not None else None]}'
+    def generate_words(self) -> Iterator[int]:
+        """
+        Lazily yield the machine word of each instruction as an integer
+        """
+        return self._iter_words(self._ast)
 
-    def _visit_SymbolDeclarationNode(self, node: SymbolDeclarationNode) -> None:
-        return None
+    def _iter_words(self, node: ProgramNode) -> Iterator[int]:
+        for c in self._visit_all(node.instructions):
+            if c is not None:
+                yield c
 
-    def _resolve_symbol_to_value(self, symbol_name: str) -> int:
-        return self._resolve_symbol(symbol_name).value
+    def _visit_ProgramNode(self, node: ProgramNode) -> str:
+        return '\n'.join(map(word_to_text, self._iter_words(node)))
 
-    def _resolve_symbol(self, symbol_name: str) -> Symbol:
-        symbol = self._symbol_table.lookup(symbol_name)
-        if symbol is None:
-            symbol = DeclaredSymbol(name=symbol_name, value=self._alloc())
-            self._symbol_table.define(symbol=symbol)
+    def _visit_AInstructionNode(self, node: AInstructionNode) -> int:
+        return encode_a_instruction(self._symbol_table.resolve(node.token.value).value if node.token.type == TokenType.SYMBOL else node.token.value)
 
-        return symbol
+    def _visit_CInstructionNode(self, node: CInstructionNode) -> int:
+        return encode_c_instruction(dest=node.dest.value if node.dest is not None else None,
+                                    comp=node.comp.value,
+                                    jump=node.jump.value if node.jump is not None else None)
 
-    def _alloc(self) -> int:
-        ptr = self._allocatable_mem_ptr
-        self._allocatable_mem_ptr += 1
-        return ptr
+    def _visit_SymbolDeclarationNode(self, node: SymbolDeclarationNode) -> None:
+        return None
@@ -0,0 +1,138 @@
+import argparse
+import functools
+import re
+from array import array
+from collections.abc import Iterator, Sequence
+from itertools import repeat
+from pathlib import Path
+from hack_assembler.encoding import C_INSTRUCTION_TABLE, MAX_A_INSTRUCTION_VALUE
+from hack_assembler.errors import Error
+from hack_assembler.rom_image import load_rom_image
+from hack_assembler.writer import write_machine_codes
+
+WORD_COUNT = 1 << 16
+"""Number of distinct 16-bit words"""
+
+LABEL_PREFIX = 'L'
+"""Prefix of the labels synthesized for jump targets, followed by the ROM address"""
+
+
+@functools.cache
+def word_table() -> tuple[list[str | None], bytearray]:
+    """
+    Text of every 16-bit word, or None if it is not a valid instruction,
+    and whether each word is a C instruction with a jump.
+
+    C instructions come from inverting `C_INSTRUCTION_TABLE`, itself built
+    from the dest, comp and jump mnemonic tables, so the disassembly of a
+    word assembles back to the same word.
+    """
+    texts: list[str | None] = [f'@{word}' for word in range(MAX_A_INSTRUCTION_VALUE + 1)]
+    texts.extend(repeat(None, WORD_COUNT - len(texts)))
+    jumps = bytearray(WORD_COUNT)
+    for (dest, comp, jump), word in C_INSTRUCTION_TABLE.items():
+        texts[word] = f'{f'{dest}=' if dest is not None else ''}{comp}{f';{jump}' if jump is not None else ''}'
+        jumps[word] = jump is not None
+    return texts, jumps
+
+
+def jump_sources(words: Sequence[int]) -> set[int]:
+    """
+    Addresses of the A instructions loading a ROM address right before
+    a jumping C instruction. A program may jump right past its end.
+    """
+    _, jumps = word_table()
+    end = len(words)
+    return {source for source, (target, word) in enumerate(zip(words, words[1:]))
+            if jumps[word] and target <= end}
+
+
+class Disassembler(object):
+    """
+    Turn machine words back into Hack assembly, one instruction per word,
+    by looking each word up in a precomputed table of all 64K words.
+
+    With **labels**, a label is declared at every jump target and the A
+    instructions loading a target right before a jump reference that
+    label instead of the address.
+    """
+
+    def __init__(self, words: Sequence[int], labels: bool = False):
+        self._words = words
+        self._labels = labels
+
+    def generate_instructions(self) -> Iterator[str]:
+        texts, _ = word_table()
+        self._check()
+        if not self._labels:
+            return map(texts.__getitem__, self._words)
+        return self._iter_labeled(texts)
+
+    def disassemble(self) -> str:
+        return '\n'.join(self.generate_instructions())
+
+    def _check(self) -> None:
+        """
+        Fail on the first word that is not an instruction, testing each distinct word only once
+        """
+        texts, _ = word_table()
+        invalid = [word for word in set(self._words) if texts[word] is None]
+        if invalid:
+            words = list(self._words)
+            address = min(words.index(word) for word in invalid)
+            raise Error(f'Invalid instruction {words[address]:016b} at ROM address {address}')
+
+    def _iter_labeled(self, texts: list[str | None]) -> Iterator[str]:
+        words = self._words
+        sources = jump_sources(words)
+        lines = list(map(texts.__getitem__, words))
+        for source in sources:
+            lines[source] = f'@{LABEL_PREFIX}{words[source]}'
+
+        start = 0
+        for target in sorted({words[source] for source in sources}):
+            yield from lines[start:target]
+            yield f'({LABEL_PREFIX}{target})'
+            start = target
+        yield from lines[start:]
+
+
+_MACHINE_CODE_REGEX = re.compile(r'[01]{16}')
+"""A line of a `.hack` file"""
+
+
+def load_words(input_file_path: str | Path) -> array:
+    """
+    Read the machine words of a `.hack` file or of a binary ROM image
+    """
+    if Path(input_file_path).suffix == '.bin':
+        with load_rom_image(input_file_path) as image:
+            return array('H', image.words)
+
+    with open(Path(input_file_path).resolve(), "r") as infile:
+        lines = infile.read().splitlines()
+    # Trailing blank lines are tolerated, like the final end of line
+    while lines and not lines[-1].strip():
+        lines.pop()
+
+    is_machine_code = _MACHINE_CODE_REGEX.fullmatch
+    for line_number, line in enumerate(lines, start=1):
+        if not is_machine_code(line.strip()):
+            raise Error(f'Invalid machine code `{line}` at line {line_number} of {input_file_path}')
+    return array('H', map(int, lines, repeat(2)))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='hack_assembler.main disasm',
+        description="Disassemble a .hack file or a binary ROM image back into Hack assembly.")
+    parser.add_argument("input", help="Path to input file (.hack or .bin)")
+    parser.add_argument("output", help="Path to output file")
+    parser.add_argument("--labels", action='store_true',
+                        help="Declare a label at every jump target and reference it from the jumps")
+    args = parser.parse_args(argv)
+
+    disassembler = Disassembler(words=load_words(args.input), labels=args.labels)
+    with open(Path(args.output).resolve(), "w") as outfile:
+        write_machine_codes(disassembler.generate_instructions(), outfile)
+    return 0
@@ -0,0 +1,219 @@
+import functools
+from array import array
+from collections.abc import Callable, Iterable, Sequence
+from hack_assembler.disassembler import word_table
+from hack_assembler.encoding import MAX_A_INSTRUCTION_VALUE
+from hack_assembler.errors import Error
+
+RAM_SIZE = 1 << 16
+"""Words of RAM, so that any value of the 16-bit A register is a valid address"""
+
+WORD_MASK = 0xFFFF
+
+SIGN_BIT = 0x8000
+
+Operation = Callable[[int, int], tuple[int, int, int]]
+"""Pre-decoded instruction: take A and D, return the next PC, A and D"""
+
+_COMP_EXPRESSIONS: dict[str, str] = {
+    '0': '0',
+    '1': '1',
+    '-1': f'{WORD_MASK}',
+    'D': 'd',
+    'A': 'a',
+    'M': 'ram[a]',
+    '!D': f'd ^ {WORD_MASK}',
+    '!A': f'a ^ {WORD_MASK}',
+    '!M': f'ram[a] ^ {WORD_MASK}',
+    '-D': f'-d & {WORD_MASK}',
+    '-A': f'-a & {WORD_MASK}',
+    '-M': f'-ram[a] & {WORD_MASK}',
+    'D+1': f'(d + 1) & {WORD_MASK}',
+    'A+1': f'(a + 1) & {WORD_MASK}',
+    'M+1': f'(ram[a] + 1) & {WORD_MASK}',
+    'D-1': f'(d - 1) & {WORD_MASK}',
+    'A-1': f'(a - 1) & {WORD_MASK}',
+    'M-1': f'(ram[a] - 1) & {WORD_MASK}',
+    'D+A': f'(d + a) & {WORD_MASK}',
+    'D+M': f'(d + ram[a]) & {WORD_MASK}',
+    'D-A': f'(d - a) & {WORD_MASK}',
+    'D-M': f'(d - ram[a]) & {WORD_MASK}',
+    'A-D': f'(a - d) & {WORD_MASK}',
+    'M-D': f'(ram[a] - d) & {WORD_MASK}',
+    'D&A': 'd & a',
+    'D&M': 'd & ram[a]',
+    'D|A': 'd | a',
+    'D|M': 'd | ram[a]',
+}
+"""Python expression computing each comp mnemonic over unsigned 16-bit values"""
+
+_JUMP_CONDITIONS: dict[str, str] = {
+    'JGT': f'0 < v < {SIGN_BIT}',
+    'JEQ': 'v == 0',
+    'JGE': f'v < {SIGN_BIT}',
+    'JLT': f'v >= {SIGN_BIT}',
+    'JNE': 'v != 0',
+    'JLE': f'v == 0 or v >= {SIGN_BIT}',
+    'JMP': 'True',
+}
+"""Python condition on the unsigned computed value **v** for each jump mnemonic"""
+
+
+class Halt(Exception):
+    """
+    Raised by the operation of an instruction stopping the program
+    """
+
+
+@functools.cache
+def _c_operation_factory(instruction: str, with_a_instruction: bool) -> Callable[..., Operation]:
+    """
+    Compile, once per distinct C instruction, a factory of operations
+    executing it. With **with_a_instruction**, the operation also
+    executes the A instruction right before it, loading a constant.
+    """
+    dest, _, comp = instruction.rpartition('=')
+    comp, _, jump = comp.partition(';')
+
+    lines = ['a = value'] if with_a_instruction else []
+    lines.append(f'v = {_COMP_EXPRESSIONS[comp]}')
+    if 'M' in dest:
+        # The A register is written at the end of the cycle: M is addressed by its old value
+        lines.append('ram[a] = v')
+    new_a = 'v' if 'A' in dest else 'a'
+    new_d = 'v' if 'D' in dest else 'd'
+    if jump == 'JMP':
+        lines.append(f'return a, {new_a}, {new_d}')
+    elif jump:
+        lines.append(f'return (a if {_JUMP_CONDITIONS[jump]} else nxt), {new_a}, {new_d}')
+    else:
+        lines.append(f'return nxt, {new_a}, {new_d}')
+
+    body = '\n        '.join(lines)
+    source = (f'def factory(ram, {"value, " if with_a_instruction else ""}nxt):\n'
+              f'    def operation(a, d):\n'
+              f'        {body}\n'
+              f'    return operation\n')
+    namespace: dict[str, object] = {}
+    exec(compile(source, f'<{instruction}>', 'exec'), namespace)
+    return namespace['factory']
+
+
+def _a_operation(value: int, nxt: int) -> Operation:
+    def operation(a: int, d: int) -> tuple[int, int, int]:
+        return nxt, value, d
+    return operation
+
+
+def _halt_operation(a: int, d: int) -> tuple[int, int, int]:
+    raise Halt()
+
+
+def _is_halt_loop(address: int, value: int, instruction: str) -> bool:
+    """
+    `(END) @END 0;JMP` and the like: the program jumps back to itself forever
+    """
+    return value == address and instruction.endswith(';JMP') and '=' not in instruction
+
+
+def decode(rom: Sequence[int], ram: array) -> tuple[list[Operation], bytes]:
+    """
+    Turn every ROM word into an operation, along with the number of
+    instructions each operation executes.
+
+    An A instruction followed by a C instruction is fused with it into a
+    single operation, halving the dispatches of typical code; the C
+    instruction keeps its own operation for jumps landing on it. Running
+    past the end of the ROM or into an endless jump to itself halts.
+    """
+    texts, _ = word_table()
+    operations: list[Operation] = []
+    sizes = bytearray()
+    end = len(rom)
+    for address, word in enumerate(rom):
+        text = texts[word]
+        if text is None:
+            raise Error(f'Invalid instruction {word:016b} at ROM address {address}')
+
+        if word <= MAX_A_INSTRUCTION_VALUE:
+            next_word = rom[address + 1] if address + 1 < end else None
+            next_text = texts[next_word] if next_word is not None and next_word > MAX_A_INSTRUCTION_VALUE else None
+            if next_text is None:
+                operations.append(_a_operation(word, address + 1))
+                sizes.append(1)
+            elif _is_halt_loop(address, word, next_text):
+                operations.append(_halt_operation)
+                sizes.append(0)
+            else:
+                operations.append(_c_operation_factory(next_text, True)(ram, word, address + 2))
+                sizes.append(2)
+        else:
+            operations.append(_c_operation_factory(text, False)(ram, address + 1))
+            sizes.append(1)
+
+    operations.append(_halt_operation)
+    sizes.append(0)
+    return operations, bytes(sizes)
+
+
+def load_program(program: Iterable[int] | Iterable[str]) -> array:
+    """
+    ROM words from `CodeGenerator` output: integer words, or lines of machine code
+    """
+    return array('H', (word if isinstance(word, int) else int(word, 2) for word in program))
+
+
+class HackCPU(object):
+    """
+    Hack computer executing a ROM pre-decoded by `decode`.
+
+    Registers and RAM hold unsigned 16-bit values, arithmetic wrapping
+    around like the hardware ALU; jump conditions read them as two's
+    complement.
+    """
+
+    def __init__(self, rom: Iterable[int] | Iterable[str]):
+        self.rom = load_program(rom)
+        self.ram = array('H', bytes(2 * RAM_SIZE))
+        self.a = 0
+        self.d = 0
+        self.pc = 0
+        self.halted = False
+        self._operations, self._sizes = decode(self.rom, self.ram)
+
+    def reset(self) -> None:
+        self.a = 0
+        self.d = 0
+        self.pc = 0
+        self.halted = False
+
+    def run(self, max_instructions: int) -> int:
+        """
+        Execute until the program halts or about **max_instructions**
+        instructions were executed (one more when the last operation is
+        a fused one).
+
+        Returns the number of executed instructions.
+        """
+        operations = self._operations
+        sizes = self._sizes
+        pc, a, d = self.pc, self.a, self.d
+        executed = 0
+        try:
+            while executed < max_instructions:
+                executed += sizes[pc]
+                pc, a, d = operations[pc](a, d)
+        except Halt:
+            self.halted = True
+        except IndexError:
+            raise Error(f'Jump outside of the ROM to address {pc}')
+        finally:
+            self.pc, self.a, self.d = pc, a, d
+        return executed
+
+
+def signed(value: int) -> int:
+    """
+    Two's complement reading of an unsigned 16-bit value
+    """
+    return value - (1 << 16) if value & SIGN_BIT else value
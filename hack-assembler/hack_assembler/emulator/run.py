@@ -0,0 +1,58 @@
+import argparse
+import time
+from array import array
+from pathlib import Path
+from hack_assembler.disassembler import load_words
+from hack_assembler.emulator.cpu import HackCPU, signed
+from hack_assembler.errors import Error
+from hack_assembler.pipeline import assemble
+
+
+def load_rom(input_file_path: str | Path) -> array:
+    """
+    ROM words of an assembly source, a `.hack` file or a binary ROM image
+    """
+    if Path(input_file_path).suffix == '.asm':
+        with open(Path(input_file_path).resolve(), "r") as infile:
+            return array('H', assemble(infile.read()))
+    return load_words(input_file_path)
+
+
+def _ram_range(text: str) -> range:
+    start, _, end = text.partition(':')
+    return range(int(start), int(end) if end else int(start) + 1)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='hack_assembler.main run',
+        description="Run a Hack program on the emulated Hack CPU and report its speed.")
+    parser.add_argument("input", help="Path to input file (.asm, .hack or .bin)")
+    parser.add_argument("--max-instructions", type=int, default=10_000_000,
+                        help="Stop after about this many instructions if the program did not halt")
+    parser.add_argument("--set", action='append', default=[], metavar='ADDRESS=VALUE',
+                        help="Initialize a RAM word before running, can be repeated")
+    parser.add_argument("--dump", action='append', default=[], metavar='START[:END]',
+                        help="Print RAM words once stopped, can be repeated")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    cpu = HackCPU(rom=load_rom(args.input))
+    decoded = time.perf_counter()
+    for assignment in args.set:
+        address, _, value = assignment.partition('=')
+        try:
+            cpu.ram[int(address)] = int(value) & 0xFFFF
+        except (ValueError, IndexError):
+            raise Error(f'Invalid RAM assignment: {assignment}')
+
+    executed = cpu.run(args.max_instructions)
+    seconds = max(time.perf_counter() - decoded, 1e-9)
+
+    print(f'{len(cpu.rom)} words decoded in {(decoded - start) * 1000:.2f} ms')
+    print(f'{executed} instructions in {seconds:.3f} s ({executed / seconds:.0f} instructions/s), '
+          f'{"halted" if cpu.halted else "stopped"} at PC {cpu.pc}')
+    for text in args.dump:
+        for address in _ram_range(text):
+            print(f'RAM[{address}] = {signed(cpu.ram[address])}')
+    return 0
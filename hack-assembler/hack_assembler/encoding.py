@@ -0,0 +1,42 @@
+from hack_assembler.constants import DEST_MNEMONICS_TABLE, COMP_MNEMONICS_TABLE, JUMP_MNEMONICS_TABLE
+from hack_assembler.errors import ValueOutOfRangeError
+
+WORD_SIZE = 16
+MAX_A_INSTRUCTION_VALUE = (1 << (WORD_SIZE - 1)) - 1
+C_INSTRUCTION_PREFIX = 0b111 << 13
+
+
+def _build_c_instruction_table() -> dict[tuple[str | None, str, str | None], int]:
+    """
+    Encode every (dest, comp, jump) combination once
+    """
+    table: dict[tuple[str | None, str, str | None], int] = {}
+    for dest, dest_code in DEST_MNEMONICS_TABLE.items():
+        for comp, comp_code in COMP_MNEMONICS_TABLE.items():
+            for jump, jump_code in JUMP_MNEMONICS_TABLE.items():
+                table[(dest, comp, jump)] = (C_INSTRUCTION_PREFIX
+                                             | int(comp_code, 2) << 6
+                                             | int(dest_code, 2) << 3
+                                             | int(jump_code, 2))
+    return table
+
+
+C_INSTRUCTION_TABLE = _build_c_instruction_table()
+"""Machine word of each C instruction, keyed by its (dest, comp, jump) mnemonics"""
+
+
+def encode_a_instruction(value: int) -> int:
+    if not 0 <= value <= MAX_A_INSTRUCTION_VALUE:
+        raise ValueOutOfRangeError(value)
+    return value
+
+
+def encode_c_instruction(dest: str | None, comp: str, jump: str | None) -> int:
+    return C_INSTRUCTION_TABLE[(dest, comp, jump)]
+
+
+def word_to_text(word: int) -> str:
+    """
+    Format a machine word as a line of a `.hack` file
+    """
+    return f'{word:016b}'
@@ -9,6 +9,17 @@ class Error(RuntimeError):
     def __str__(self) -> str:
         return self.message
 
+    def __reduce__(self):
+        # Subclasses do not take the message as argument: rebuild them from the
+        # message alone, so that errors raised in worker processes reach the parent
+        return _restore_error, (type(self), self.message)
+
+
+def _restore_error(cls: type[Error], message: str | None) -> Error:
+    error = cls.__new__(cls)
+    Error.__init__(error, message)
+    return error
+
 
 class LexerError(Error):
     pass
@@ -32,3 +43,8 @@ class SemanticError(Error):
 class DuplicatedSymbolError(SemanticError):
     def __init__(self, symbol_name: str):
         super().__init__(f'Duplicated symbol {symbol_name}')
+
+
+class ValueOutOfRangeError(SemanticError):
+    def __init__(self, value: int):
+        super().__init__(f'Value {value} does not fit in an A instruction')
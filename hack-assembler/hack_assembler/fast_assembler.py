@@ -0,0 +1,121 @@
+import re
+from hack_assembler.constants import MNEMONICS
+from hack_assembler.encoding import C_INSTRUCTION_TABLE, encode_a_instruction, word_to_text
+from hack_assembler.errors import DuplicatedSymbolError
+from hack_assembler.fixups import encode_instructions, patch_fixups
+from hack_assembler.parser import Parser
+from hack_assembler.regex_lexer import RegexLexer
+from hack_assembler.symbol_table import SymbolTable, DeclaredSymbol
+
+
+def _c_instruction_table() -> dict[str, int]:
+    """
+    Map the source text of every valid C instruction (`dest=comp;jump`)
+    to its machine word.
+    """
+    return {f'{f'{dest}=' if dest is not None else ''}{comp}{f';{jump}' if jump is not None else ''}': word
+            for (dest, comp, jump), word in C_INSTRUCTION_TABLE.items()}
+
+
+_C_INSTRUCTIONS = _c_instruction_table()
+
+_SYMBOL_REGEX = re.compile(r'(?:[^\W\d]|[.$:])[\w.$:]*')
+"""A symbol exactly as the lexers recognize it"""
+
+
+class FastAssembler(object):
+    """
+    Line-oriented assembler for Hack assembly language.
+
+    Hack assembly has at most one instruction per line, so each line is
+    classified directly (label, A instruction or C instruction looked up
+    in a precomputed table) and encoded in two passes without building
+    tokens or an AST. A line it cannot classify is handed to the full
+    `Parser`, so malformed input fails with the same errors as the
+    regular pipeline.
+    """
+
+    def __init__(self, text: str):
+        self._text = text
+        self._symbol_table = SymbolTable()
+
+    def assemble(self) -> str:
+        return '\n'.join(self.generate_machine_codes())
+
+    def generate_machine_codes(self) -> list[str]:
+        return list(map(word_to_text, self.generate_words()))
+
+    def generate_words(self) -> list[int]:
+        words: list[int] = []
+        unresolved_symbols: list[tuple[int, str]] = []
+        """ROM address and name of every A instruction referencing a symbol"""
+        labels: list[tuple[str, int]] = []
+
+        c_instructions = _C_INSTRUCTIONS
+        is_symbol = _SYMBOL_REGEX.fullmatch
+
+        # First pass: classify every line and record labels with their ROM address
+        lines = self._text.split('\n')
+        for line_number, raw_line in enumerate(lines, start=1):
+            line = raw_line
+            comment_pos = line.find('//')
+            if comment_pos != -1:
+                line = line[:comment_pos]
+            line = line.strip()
+            if not line:
+                continue
+
+            word = c_instructions.get(line)
+            if word is not None:
+                words.append(word)
+                continue
+
+            first_char = line[0]
+            if first_char == '@':
+                value = line[1:]
+                if value.isdecimal():
+                    words.append(encode_a_instruction(int(value)))
+                    continue
+                if is_symbol(value) and value not in MNEMONICS:
+                    unresolved_symbols.append((len(words), value))
+                    words.append(0)
+                    continue
+            elif first_char == '(' and line[-1] == ')':
+                name = line[1:-1]
+                if is_symbol(name) and name not in MNEMONICS:
+                    labels.append((name, len(words)))
+                    continue
+
+            # Keep the line untouched so that errors report the original column
+            # and the end of line token the parser expects
+            self._parse_line(line=raw_line if line_number == len(lines) else f'{raw_line}\n',
+                             line_number=line_number,
+                             words=words,
+                             unresolved_symbols=unresolved_symbols,
+                             labels=labels)
+
+        for name, address in labels:
+            if self._symbol_table.lookup(name) is None:
+                self._symbol_table.define(DeclaredSymbol(name=name, value=address))
+            else:
+                raise DuplicatedSymbolError(name)
+
+        # Second pass: resolve symbols, allocating variables in order of first use
+        patch_fixups(words, unresolved_symbols, self._symbol_table)
+        return words
+
+    def _parse_line(self,
+                    line: str,
+                    line_number: int,
+                    words: list[int],
+                    unresolved_symbols: list[tuple[int, str]],
+                    labels: list[tuple[str, int]]) -> None:
+        """
+        Fall back to the full lexer and parser for a line the fast path cannot classify.
+        """
+        ast = Parser(lexer=RegexLexer(text=line, line=line_number)).parse()
+        encode_instructions(ast.instructions,
+                            symbol_table=self._symbol_table,
+                            words=words,
+                            fixups=unresolved_symbols,
+                            declare_label=lambda name, address: labels.append((name, address)))
@@ -0,0 +1,46 @@
+from collections.abc import Callable, Iterable, MutableSequence
+from hack_assembler.ast import AstNode, AInstructionNode, CInstructionNode
+from hack_assembler.encoding import encode_a_instruction, encode_c_instruction
+from hack_assembler.symbol_table import SymbolTable
+from hack_assembler.tokens import TokenType
+
+
+def encode_instructions(nodes: Iterable[AstNode],
+                        symbol_table: SymbolTable,
+                        words: MutableSequence[int],
+                        fixups: list[tuple[int, str]],
+                        declare_label: Callable[[str, int], None]) -> None:
+    """
+    Append the machine word of each instruction to **words**.
+
+    A reference to a symbol unknown to **symbol_table** leaves a
+    placeholder word and a fixup with its ROM address, to be patched by
+    `patch_fixups` once every label is known. **declare_label** is called
+    with the name and ROM address of each label declaration.
+    """
+    for node in nodes:
+        if isinstance(node, CInstructionNode):
+            words.append(encode_c_instruction(dest=node.dest.value if node.dest is not None else None,
+                                              comp=node.comp.value,
+                                              jump=node.jump.value if node.jump is not None else None))
+        elif isinstance(node, AInstructionNode):
+            if node.token.type == TokenType.SYMBOL:
+                symbol = symbol_table.lookup(node.token.value)
+                if symbol is None:
+                    fixups.append((len(words), node.token.value))
+                    words.append(0)
+                else:
+                    words.append(encode_a_instruction(symbol.value))
+            else:
+                words.append(encode_a_instruction(node.token.value))
+        else:
+            declare_label(node.token.value, len(words))
+
+
+def patch_fixups(words: MutableSequence[int], fixups: Iterable[tuple[int, str]], symbol_table: SymbolTable) -> None:
+    """
+    Encode the symbol of every fixup, in the given order, which is also the
+    order in which the symbols left undefined are allocated as variables
+    """
+    for address, name in fixups:
+        words[address] = encode_a_instruction(symbol_table.resolve(name).value)
@@ -0,0 +1,211 @@
+from itertools import chain
+from hack_assembler.ast import AstNode, AInstructionNode, CInstructionNode, SymbolDeclarationNode
+from hack_assembler.encoding import encode_a_instruction, encode_c_instruction, word_to_text
+from hack_assembler.errors import Error, DuplicatedSymbolError
+from hack_assembler.parser import Parser
+from hack_assembler.regex_lexer import RegexLexer
+from hack_assembler.symbol_table import FIRST_VARIABLE_ADDRESS, SymbolTable, DeclaredSymbol
+from hack_assembler.tokens import TokenType
+
+
+def _node_line(node: AstNode) -> int:
+    if isinstance(node, CInstructionNode):
+        token = node.comp if node.comp is not None else node.dest
+        return token.line
+    return node.token.line
+
+
+class IncrementalAssembler(object):
+    """
+    Assembler keeping the state of its last build, so that editing the
+    source only costs work proportional to the edit.
+
+    An edit re-parses only the replaced lines, shifts the ROM address of
+    the labels declared after them, re-allocates variables in order of
+    first use and re-encodes only the A instructions whose resolved
+    value changed. The produced words are always identical to a full
+    `Parser` -> `SemanticAnalyzer` -> `CodeGenerator` build of the
+    current source.
+    """
+
+    def __init__(self, text: str):
+        self._lines: list[str] = []
+        self._line_nodes: list[AstNode | None] = []
+        """Label or instruction declared on each line"""
+        self._line_word_counts = bytearray()
+        """Number of words (0 or 1) produced by each line, summed to find ROM addresses"""
+
+        self._words: list[int] = []
+        self._references: list[str | None] = []
+        """Symbol referenced by each instruction, None if it does not reference any"""
+
+        self._label_lines: dict[str, int] = {}
+        """Line index of each label declaration"""
+        self._variables: dict[str, int] = {}
+
+        self._builtin_symbols = SymbolTable()
+        self._symbol_table = SymbolTable()
+
+        self.apply_edit(start=0, end=0, new_lines=text.split('\n'))
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(self._lines)
+
+    @property
+    def symbol_table(self) -> SymbolTable:
+        return self._symbol_table
+
+    def assemble(self) -> str:
+        return '\n'.join(self.generate_machine_codes())
+
+    def generate_machine_codes(self) -> list[str]:
+        return list(map(word_to_text, self._words))
+
+    def generate_words(self) -> list[int]:
+        return list(self._words)
+
+    def update(self, text: str) -> int:
+        """
+        Re-assemble after the source changed to **text**, as a single edit
+        covering the lines between the unchanged head and tail of the file.
+
+        Returns the number of encoded words.
+        """
+        new_lines = text.split('\n')
+        old_lines = self._lines
+
+        limit = min(len(old_lines), len(new_lines))
+        head = 0
+        while head < limit and old_lines[head] == new_lines[head]:
+            head += 1
+        tail = 0
+        while tail < limit - head and old_lines[-1 - tail] == new_lines[-1 - tail]:
+            tail += 1
+
+        return self.apply_edit(start=head,
+                               end=len(old_lines) - tail,
+                               new_lines=new_lines[head:len(new_lines) - tail])
+
+    def apply_edit(self, start: int, end: int, new_lines: list[str]) -> int:
+        """
+        Replace the lines from index **start** to **end** (excluded, 0-based)
+        with **new_lines**.
+
+        The state is left untouched if the new lines fail to parse or
+        declare a duplicated label.
+
+        Returns the number of encoded words.
+        """
+        if not 0 <= start <= end <= len(self._lines):
+            raise Error(f'Invalid line range [{start}, {end}) for a source of {len(self._lines)} lines')
+
+        # region Parse the new lines only
+        at_end = end == len(self._lines)
+        text = '\n'.join(new_lines) if at_end else ''.join(f'{line}\n' for line in new_lines)
+        ast = Parser(lexer=RegexLexer(text=text, line=start + 1)).parse()
+
+        block_nodes: list[AstNode | None] = [None] * len(new_lines)
+        block_word_counts = bytearray(len(new_lines))
+        for node in ast.instructions:
+            offset = _node_line(node) - start - 1
+            block_nodes[offset] = node
+            if not isinstance(node, SymbolDeclarationNode):
+                block_word_counts[offset] = 1
+        # endregion
+
+        first_address = sum(self._line_word_counts[:start])
+        old_count = sum(self._line_word_counts[start:end])
+
+        block_words: list[int] = []
+        block_references: list[str | None] = []
+        block_labels: list[tuple[str, int, int]] = []
+        for offset, node in enumerate(block_nodes):
+            if node is None:
+                continue
+
+            if isinstance(node, SymbolDeclarationNode):
+                block_labels.append((node.token.value, start + offset, first_address + len(block_words)))
+            elif isinstance(node, AInstructionNode):
+                if node.token.type == TokenType.SYMBOL:
+                    block_references.append(node.token.value)
+                    block_words.append(0)  # Encoded once symbols are resolved
+                else:
+                    block_references.append(None)
+                    block_words.append(encode_a_instruction(node.token.value))
+            elif isinstance(node, CInstructionNode):
+                block_references.append(None)
+                block_words.append(encode_c_instruction(dest=node.dest.value if node.dest is not None else None,
+                                                        comp=node.comp.value,
+                                                        jump=node.jump.value if node.jump is not None else None))
+
+        new_count = len(block_words)
+        address_delta = new_count - old_count
+        line_delta = len(new_lines) - (end - start)
+
+        # region Shift labels declared after the edit, validated before any state change
+        old_values = {name: self._symbol_table.lookup(name).value
+                      for name in chain(self._label_lines, self._variables)}
+
+        labels: dict[str, tuple[int, int]] = {}
+        """Line index and ROM address of each label"""
+        for name, line in self._label_lines.items():
+            if line < start:
+                labels[name] = (line, old_values[name])
+            elif line >= end:
+                labels[name] = (line + line_delta, old_values[name] + address_delta)
+
+        for name, line, address in block_labels:
+            if name in labels or self._builtin_symbols.lookup(name) is not None:
+                raise DuplicatedSymbolError(name)
+            labels[name] = (line, address)
+        # endregion
+
+        self._lines[start:end] = new_lines
+        self._line_nodes[start:end] = block_nodes
+        self._line_word_counts[start:end] = block_word_counts
+        self._words[first_address:first_address + old_count] = block_words
+        self._references[first_address:first_address + old_count] = block_references
+        self._label_lines = {name: line for name, (line, _) in labels.items()}
+
+        # region Allocate variables in order of first use, as `CodeGenerator` does
+        variables: dict[str, int] = {}
+        allocatable_mem_ptr = FIRST_VARIABLE_ADDRESS
+        for name in self._references:
+            if name is None or name in variables or name in labels or self._builtin_symbols.lookup(name) is not None:
+                continue
+            variables[name] = allocatable_mem_ptr
+            allocatable_mem_ptr += 1
+        self._variables = variables
+        # endregion
+
+        # region Update the symbol table with the symbols whose value changed
+        new_values = {name: address for name, (_, address) in labels.items()}
+        new_values.update(variables)
+
+        for name in old_values.keys() - new_values.keys():
+            self._symbol_table.remove(name)
+
+        changed_symbols: set[str] = set()
+        for name, value in new_values.items():
+            if old_values.get(name) != value:
+                self._symbol_table.define(DeclaredSymbol(name=name, value=value))
+                changed_symbols.add(name)
+        # endregion
+
+        # region Encode the new A instructions and those whose symbol value changed
+        encoded = new_count
+        block_end = first_address + new_count
+        for address in range(first_address, block_end):
+            name = self._references[address]
+            if name is not None:
+                self._words[address] = encode_a_instruction(self._symbol_table.lookup(name).value)
+
+        if changed_symbols:
+            for address, name in enumerate(self._references):
+                if name in changed_symbols and not first_address <= address < block_end:
+                    self._words[address] = encode_a_instruction(self._symbol_table.lookup(name).value)
+                    encoded += 1
+        # endregion
+
+        return encoded
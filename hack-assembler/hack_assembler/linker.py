@@ -0,0 +1,84 @@
+import argparse
+from array import array
+from pathlib import Path
+from hack_assembler.encoding import encode_a_instruction
+from hack_assembler.errors import Error, DuplicatedSymbolError
+from hack_assembler.object_file import RELOCATE_LABEL, ObjectFile, assemble_object_file, load_object_file
+from hack_assembler.pipeline import OBJECT_EXTENSION, OUTPUT_EXTENSIONS, write_words
+from hack_assembler.symbol_table import SymbolTable, DeclaredSymbol
+
+
+class Linker(object):
+    """
+    Combine object files into a single program.
+
+    Objects are laid out one after another in the given order: their
+    exported labels are shifted by the address of their first word and
+    their own label references relocated the same way. Imported symbols
+    that no object exports are variables, allocated from 16 upward in
+    order of first use, so linking gives the same words as assembling
+    the concatenated sources.
+    """
+
+    def __init__(self, objects: list[ObjectFile]):
+        self._objects = objects
+        self._symbol_table = SymbolTable()
+
+    def generate_words(self) -> array:
+        words = array('H')
+        bases: list[int] = []
+        for obj in self._objects:
+            base = len(words)
+            bases.append(base)
+            for name, address in obj.exports:
+                if self._symbol_table.lookup(name) is not None:
+                    raise DuplicatedSymbolError(name)
+                self._symbol_table.define(DeclaredSymbol(name=name, value=base + address))
+            words.extend(obj.words)
+
+        # Every label is known at this point: relocate in ROM order so variables are allocated by first use
+        for obj, base in zip(self._objects, bases):
+            for address, kind, index in obj.relocations:
+                if kind == RELOCATE_LABEL:
+                    words[base + address] = encode_a_instruction(base + words[base + address])
+                else:
+                    words[base + address] = encode_a_instruction(self._symbol_table.resolve(obj.imports[index]).value)
+
+        return words
+
+
+def load_or_assemble(input_file_path: Path) -> ObjectFile:
+    """
+    Load an object file, or the object file of an assembly source,
+    assembling the source again only when it is newer than its object
+    """
+    if input_file_path.suffix == OBJECT_EXTENSION:
+        return load_object_file(input_file_path)
+    if input_file_path.suffix != '.asm':
+        raise Error(f'Invalid hack assembly or object file: {input_file_path}')
+
+    object_file_path = input_file_path.with_suffix(OBJECT_EXTENSION)
+    if object_file_path.exists() and object_file_path.stat().st_mtime >= input_file_path.stat().st_mtime:
+        return load_object_file(object_file_path)
+    return assemble_object_file(input_file_path, object_file_path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='hack_assembler.main link',
+        description="Link object files into a Hack program. Assembly sources are assembled into "
+                    "object files next to them first, unless their object file is up to date.")
+    parser.add_argument("inputs", nargs='+', help="Object files or assembly sources, in link order")
+    parser.add_argument("--output", "-o", required=True, help="Path to output file")
+    parser.add_argument("--format", choices=list(OUTPUT_EXTENSIONS), default='text',
+                        help="Output format: textual .hack file (default) or binary ROM image (.bin)")
+    parser.add_argument("--byteorder", choices=['little', 'big'], default='little',
+                        help="Byte order of the words of a binary ROM image")
+    args = parser.parse_args(argv)
+
+    objects = [load_or_assemble(Path(p)) for p in args.inputs]
+    write_words(Linker(objects=objects).generate_words(),
+                args.output,
+                format=args.format,
+                byteorder=args.byteorder)
+    return 0
@@ -1,19 +1,38 @@
 from typing import cast
 import argparse
-from pathlib import Path
+import sys
 from hack_assembler.errors import Error
-from hack_assembler.lexer import Lexer
-from hack_assembler.tokens import TokenType
-from hack_assembler.parser import Parser
-from hack_assembler.semantic_analyzer import SemanticAnalyzer
-from hack_assembler.code_generator import CodeGenerator
+from pathlib import Path
+from hack_assembler.pipeline import OBJECT_EXTENSION, add_assembly_arguments, assemble_file, cache_from_args
+from hack_assembler.watch import Watcher, add_watch_arguments
 
 
 def main() -> None:
+    if sys.argv[1:2] == ['build']:
+        # Imported on demand: the process pool machinery is slow to import
+        from hack_assembler import batch
+        sys.exit(batch.main(sys.argv[2:]))
+    if sys.argv[1:2] == ['link']:
+        from hack_assembler import linker
+        sys.exit(linker.main(sys.argv[2:]))
+    if sys.argv[1:2] == ['disasm']:
+        from hack_assembler import disassembler
+        sys.exit(disassembler.main(sys.argv[2:]))
+    if sys.argv[1:2] == ['run']:
+        from hack_assembler.emulator import run
+        sys.exit(run.main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
-        description="Simple Hack assembler.")
+        description="Simple Hack assembler. Use `build DIR` to assemble a whole directory, "
+                    "`link -o OUTPUT INPUTS...` to link object files, "
+                    "`disasm INPUT OUTPUT` to disassemble machine code, "
+                    "`run INPUT` to execute it on the emulated CPU.")
     parser.add_argument("input", help="Path to input file")
-    parser.add_argument("output", help="Path to output file")
+    parser.add_argument("output", help=f"Path to output file, a relocatable object if it ends with {OBJECT_EXTENSION}")
+    add_assembly_arguments(parser)
+    parser.add_argument("--chunks", type=int, default=1,
+                        help="Split the input into this many chunks assembled in parallel worker processes")
+    add_watch_arguments(parser)
     args = parser.parse_args()
 
     input_file_path = args.input
@@ -22,30 +41,34 @@ def main() -> None:
     if not cast(str, input_file_path).endswith('.asm'):
         raise Error(f'Invalid hack assembly file: {input_file_path}')
 
-    if not cast(str, output_file_path).endswith('.hack'):
-        raise Error(f'Invalid hack machine code file: {output_file_path}')
-
-    with open(Path(input_file_path).resolve(), "r") as infile:
-        asm_code = infile.read()
+    if cast(str, output_file_path).endswith(OBJECT_EXTENSION):
+        # Relocatable object, to be linked with `link`
+        from hack_assembler.object_file import assemble_object_file
+        assemble_object_file(input_file_path, output_file_path)
+        return
 
-        lexer = Lexer(
-            text=asm_code
-        )
-        parser = Parser(lexer=lexer)
-
-        ast = parser.parse()
-        sematic_analyzer = SemanticAnalyzer(ast=ast)
-
-        symbol_table = sematic_analyzer.analyze()
-
-        code_generator = CodeGenerator(
-            ast=ast,
-            symbol_table=symbol_table
-        )
-        machine_code = code_generator.generate_binary_code()
+    if args.format == 'bin':
+        if not cast(str, output_file_path).endswith('.bin'):
+            raise Error(f'Invalid hack ROM image file: {output_file_path}')
+    elif not cast(str, output_file_path).endswith('.hack'):
+        raise Error(f'Invalid hack machine code file: {output_file_path}')
 
-        with open(Path(output_file_path).resolve(), "w") as outfile:
-            outfile.write(machine_code)
+    if args.watch:
+        Watcher(targets=[(Path(input_file_path), Path(output_file_path))],
+                format=args.format,
+                byteorder=args.byteorder,
+                interval=args.interval).run()
+        return
+
+    assemble_file(input_file_path,
+                  output_file_path,
+                  lexer=args.lexer,
+                  fast=args.fast,
+                  single_pass=args.single_pass,
+                  chunks=args.chunks,
+                  format=args.format,
+                  byteorder=args.byteorder,
+                  cache=cache_from_args(args))
 
 
 if __name__ == '__main__':
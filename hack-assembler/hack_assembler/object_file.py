@@ -0,0 +1,154 @@
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import BinaryIO
+from hack_assembler.chunked import assemble_chunk
+from hack_assembler.errors import Error, DuplicatedSymbolError
+from hack_assembler.symbol_table import SymbolTable, DeclaredSymbol
+
+MAGIC = b'HOBJ'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBBHIIII')
+"""magic, version, reserved, reserved, word count, relocation count, export count, import count"""
+
+_RELOCATION = struct.Struct('<IBI')
+"""address, kind, index of the imported symbol"""
+
+_EXPORT_ADDRESS = struct.Struct('<I')
+
+_NAME_LENGTH = struct.Struct('<H')
+
+RELOCATE_LABEL = 0
+"""The word holds the address of a label of the same object, relative to its first word"""
+RELOCATE_IMPORT = 1
+"""The word is a placeholder for an imported symbol: a label of another object, or a variable"""
+
+
+class ObjectFile(object):
+    """
+    Relocatable output of assembling one module.
+
+    Words referencing a label of the module hold its address relative to
+    the first word of the module, those referencing any other symbol are
+    left to zero; a relocation entry records which is which. Predefined
+    symbols and numbers are fully encoded.
+    """
+
+    def __init__(self,
+                 words: array,
+                 relocations: list[tuple[int, int, int]],
+                 exports: list[tuple[str, int]],
+                 imports: list[str]):
+        self.words = words
+        self.relocations = relocations
+        """Address, kind and import index of every word to fix at link time, in address order"""
+        self.exports = exports
+        """Name and relative address of every label declared in the module"""
+        self.imports = imports
+        """Symbols referenced but not declared in the module, in order of first use"""
+
+
+def assemble_object(text: str) -> ObjectFile:
+    """
+    Assemble a module into an object file, resolving its own labels
+    against a module `SymbolTable` and importing every other symbol
+    """
+    chunk = assemble_chunk(text, line=1)
+
+    symbol_table = SymbolTable()
+    for name, address in chunk.labels:
+        if symbol_table.lookup(name) is not None:
+            raise DuplicatedSymbolError(name)
+        symbol_table.define(DeclaredSymbol(name=name, value=address))
+
+    words = chunk.words
+    relocations: list[tuple[int, int, int]] = []
+    imports: dict[str, int] = {}
+    for address, name in chunk.fixups:
+        # Predefined symbols were encoded while assembling: only labels can be found
+        symbol = symbol_table.lookup(name)
+        if symbol is not None:
+            words[address] = symbol.value
+            relocations.append((address, RELOCATE_LABEL, 0))
+        else:
+            relocations.append((address, RELOCATE_IMPORT, imports.setdefault(name, len(imports))))
+
+    return ObjectFile(words=words, relocations=relocations, exports=chunk.labels, imports=list(imports))
+
+
+def _write_name(outfile: BinaryIO, name: str) -> None:
+    data = name.encode()
+    outfile.write(_NAME_LENGTH.pack(len(data)))
+    outfile.write(data)
+
+
+def write_object_file(obj: ObjectFile, outfile: BinaryIO) -> None:
+    """
+    Write **obj** as a header, the little-endian words, the relocation
+    entries, then the exported and imported symbol tables
+    """
+    outfile.write(_HEADER.pack(MAGIC, VERSION, 0, 0,
+                               len(obj.words), len(obj.relocations), len(obj.exports), len(obj.imports)))
+
+    words = array('H', obj.words)
+    if sys.byteorder != 'little':
+        words.byteswap()
+    outfile.write(words.tobytes())
+
+    outfile.write(b''.join(_RELOCATION.pack(*relocation) for relocation in obj.relocations))
+    for name, address in obj.exports:
+        outfile.write(_EXPORT_ADDRESS.pack(address))
+        _write_name(outfile, name)
+    for name in obj.imports:
+        _write_name(outfile, name)
+
+
+def load_object_file(path: str | Path) -> ObjectFile:
+    data = Path(path).read_bytes()
+    try:
+        magic, version, _, _, word_count, relocation_count, export_count, import_count = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise Error(f'Invalid hack object file: {path}')
+        offset = _HEADER.size
+
+        words = array('H')
+        words.frombytes(data[offset:offset + 2 * word_count])
+        if len(words) != word_count:
+            raise Error(f'Invalid hack object file: {path}')
+        if sys.byteorder != 'little':
+            words.byteswap()
+        offset += 2 * word_count
+
+        size = _RELOCATION.size * relocation_count
+        relocations = list(_RELOCATION.iter_unpack(data[offset:offset + size]))
+        if len(relocations) != relocation_count:
+            raise Error(f'Invalid hack object file: {path}')
+        offset += size
+
+        def read_name() -> str:
+            nonlocal offset
+            (length,) = _NAME_LENGTH.unpack_from(data, offset)
+            offset += _NAME_LENGTH.size + length
+            return data[offset - length:offset].decode()
+
+        exports: list[tuple[str, int]] = []
+        for _ in range(export_count):
+            (address,) = _EXPORT_ADDRESS.unpack_from(data, offset)
+            offset += _EXPORT_ADDRESS.size
+            exports.append((read_name(), address))
+        imports = [read_name() for _ in range(import_count)]
+    except (struct.error, UnicodeDecodeError):
+        raise Error(f'Invalid hack object file: {path}')
+
+    return ObjectFile(words=words, relocations=relocations, exports=exports, imports=imports)
+
+
+def assemble_object_file(input_file_path: str | Path, output_file_path: str | Path) -> ObjectFile:
+    with open(Path(input_file_path).resolve(), "r") as infile:
+        obj = assemble_object(infile.read())
+
+    with open(Path(output_file_path).resolve(), "wb") as outfile:
+        write_object_file(obj, outfile)
+    return obj
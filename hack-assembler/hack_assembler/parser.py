@@ -1,5 +1,7 @@
+from collections.abc import Iterator
 from hack_assembler.tokens import Token, TokenType
 from hack_assembler.lexer import Lexer
+from hack_assembler.regex_lexer import RegexLexer
 from hack_assembler.ast import AstNode, ProgramNode, SymbolDeclarationNode, AInstructionNode, CInstructionNode
 from hack_assembler.errors import UnexpectedTokenError
 from hack_assembler.constants import DEST_MNEMONICS, COMP_MNEMONICS, JUMP_MNEMONICS
@@ -7,16 +9,24 @@ from hack_assembler.constants import DEST_MNEMONICS, COMP_MNEMONICS, JUMP_MNEMON
 
 class Parser(object):
 
-    def __init__(self, lexer: Lexer) -> None:
+    def __init__(self, lexer: Lexer | RegexLexer) -> None:
         self._lexer = lexer
         self._current_token: Token = self._lexer.get_next_token()
 
     def parse(self) -> ProgramNode:
         return self._program()
 
+    def iter_instructions(self) -> Iterator[AstNode]:
+        """
+        Lazily yield each instruction node as soon as it is parsed, so that
+        the whole program never has to be held in memory
+        """
+        return self._instructions()
+
     def _program(self) -> ProgramNode:
-        instructions: list[AstNode] = []
+        return ProgramNode(instructions=list(self._instructions()))
 
+    def _instructions(self) -> Iterator[AstNode]:
         while True:
             match self._current_token.type:
                 case TokenType.EOF:
@@ -31,7 +41,7 @@ class Parser(object):
                     token = self._current_token
                     self._eat(TokenType.SYMBOL)
                     self._eat(TokenType.RPAREN)
-                    instructions.append(SymbolDeclarationNode(token=token))
+                    yield SymbolDeclarationNode(token=token)
 
                 case TokenType.AT_SIGN:
                     # A instruction
@@ -39,7 +49,7 @@ class Parser(object):
                     token = self._current_token
                     self._eat(TokenType.INTEGER if self._current_token.type ==
                               TokenType.INTEGER else TokenType.SYMBOL)
-                    instructions.append(AInstructionNode(token=token))
+                    yield AInstructionNode(token=token)
 
                 case TokenType.MNEMONIC:
                     # C instruction
@@ -69,11 +79,11 @@ class Parser(object):
                     if comp is None and (dest is None or jump is None):
                         raise UnexpectedTokenError(token=self._current_token)
 
-                    instructions.append(CInstructionNode(
+                    yield CInstructionNode(
                         comp=comp,
                         dest=dest,
                         jump=jump
-                    ))
+                    )
 
                 case _:
                     raise UnexpectedTokenError(
@@ -89,8 +99,6 @@ class Parser(object):
 
         self._eat(TokenType.EOF)  # End of program
 
-        return ProgramNode(instructions=instructions)
-
     def _eat(self, token_type: TokenType) -> None:
         """
         Compare the current token type with the passed token
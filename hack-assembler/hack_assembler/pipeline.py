@@ -0,0 +1,150 @@
+import argparse
+import os
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+from hack_assembler.lexer import Lexer
+from hack_assembler.regex_lexer import RegexLexer
+from hack_assembler.parser import Parser
+from hack_assembler.semantic_analyzer import SemanticAnalyzer
+from hack_assembler.code_generator import CodeGenerator
+from hack_assembler.fast_assembler import FastAssembler
+from hack_assembler.single_pass import SinglePassAssembler
+from hack_assembler.writer import write_machine_codes
+from hack_assembler.encoding import word_to_text
+from hack_assembler.rom_image import ByteOrder, write_rom_image
+from hack_assembler.cache import CACHE_ENVIRONMENT_VARIABLE, DEFAULT_MAX_SIZE, BuildCache
+
+OUTPUT_EXTENSIONS: dict[str, str] = {
+    'text': '.hack',
+    'bin': '.bin',
+}
+"""File extension of each output format"""
+
+OBJECT_EXTENSION = '.hobj'
+"""File extension of relocatable object files"""
+
+
+def assemble(asm_code: str,
+             lexer: str = 'regex',
+             fast: bool = False,
+             single_pass: bool = False,
+             chunks: int = 1) -> Iterable[int]:
+    """
+    Assemble Hack assembly source code into machine words.
+
+    Parsing and semantic analysis happen eagerly, but the words may be
+    encoded lazily: an out of range constant is only raised while
+    iterating over them.
+    """
+    if chunks > 1:
+        # Imported on demand: the process pool machinery is slow to import
+        from hack_assembler.chunked import ChunkedAssembler
+        return ChunkedAssembler(text=asm_code, chunks=chunks).generate_words()
+    if fast:
+        return FastAssembler(text=asm_code).generate_words()
+    if single_pass:
+        return SinglePassAssembler(text=asm_code, lexer=lexer).generate_words()
+
+    parser = Parser(lexer=(RegexLexer if lexer == 'regex' else Lexer)(
+        text=asm_code
+    ))
+
+    ast = parser.parse()
+    sematic_analyzer = SemanticAnalyzer(ast=ast)
+
+    symbol_table = sematic_analyzer.analyze()
+
+    code_generator = CodeGenerator(
+        ast=ast,
+        symbol_table=symbol_table
+    )
+    return code_generator.generate_words()
+
+
+def write_words(words: Iterable[int],
+                output_file_path: str | Path,
+                format: str = 'text',
+                byteorder: ByteOrder = 'little') -> None:
+    """
+    Write **words** to a temporary file next to the output file, then
+    rename it over the output file. An error raised while producing the
+    words leaves any previous output file untouched.
+    """
+    output_file_path = Path(output_file_path).resolve()
+    tmp_path = output_file_path.with_name(f'.{output_file_path.name}.{os.getpid()}.tmp')
+    try:
+        if format == 'bin':
+            with open(tmp_path, "wb") as binfile:
+                write_rom_image(words, binfile, byteorder=byteorder)
+        else:
+            with open(tmp_path, "w") as outfile:
+                write_machine_codes(map(word_to_text, words), outfile)
+        os.replace(tmp_path, output_file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def assemble_file(input_file_path: str | Path,
+                  output_file_path: str | Path,
+                  lexer: str = 'regex',
+                  fast: bool = False,
+                  single_pass: bool = False,
+                  chunks: int = 1,
+                  format: str = 'text',
+                  byteorder: ByteOrder = 'little',
+                  cache: BuildCache | None = None) -> None:
+    with open(Path(input_file_path).resolve(), "r") as infile:
+        asm_code = infile.read()
+
+    if cache is None:
+        words = assemble(asm_code, lexer=lexer, fast=fast, single_pass=single_pass, chunks=chunks)
+    else:
+        key = cache.key(asm_code)
+        words = cache.get(key)
+        if words is None:
+            words = array('H', assemble(asm_code, lexer=lexer, fast=fast, single_pass=single_pass, chunks=chunks))
+            cache.put(key, words)
+
+    write_words(words,
+                output_file_path,
+                format=format,
+                byteorder=byteorder)
+
+
+def add_assembly_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Register the options shared by the single-file and batch command lines
+    """
+    parser.add_argument("--lexer", choices=['regex', 'char'], default='regex',
+                        help="Tokenizer engine: compiled master regex (default) or character-by-character scanner")
+    parser.add_argument("--fast", action='store_true',
+                        help="Assemble line by line without building tokens and AST")
+    parser.add_argument("--single-pass", action='store_true',
+                        help="Encode each instruction as soon as it is parsed and patch forward references at the end")
+    parser.add_argument("--format", choices=['text', 'bin'], default='text',
+                        help="Output format: textual .hack file (default) or binary ROM image (.bin)")
+    parser.add_argument("--byteorder", choices=['little', 'big'], default='little',
+                        help="Byte order of the words of a binary ROM image")
+    parser.add_argument("--cache", action='store_true',
+                        help=f"Reuse the words of sources assembled before from the build cache, "
+                             f"also enabled by setting ${CACHE_ENVIRONMENT_VARIABLE}=1")
+    parser.add_argument("--no-cache", action='store_true',
+                        help=f"Always assemble, even when ${CACHE_ENVIRONMENT_VARIABLE} is set")
+    parser.add_argument("--cache-dir", type=Path,
+                        help="Build cache directory, implies --cache (default: $XDG_CACHE_HOME/hack-assembler)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_SIZE // (1024 * 1024),
+                        help="Size limit of the build cache in MB, least recently used entries are evicted")
+
+
+def cache_from_args(args: argparse.Namespace) -> BuildCache | None:
+    """
+    The build cache is off unless asked for, so that assembling writes
+    nothing outside of the output file
+    """
+    enabled = args.cache or args.cache_dir is not None \
+        or os.environ.get(CACHE_ENVIRONMENT_VARIABLE, '') not in ('', '0')
+    if args.no_cache or not enabled:
+        return None
+    return BuildCache(directory=args.cache_dir, max_size=args.cache_size * 1024 * 1024)
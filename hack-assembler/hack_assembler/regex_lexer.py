@@ -0,0 +1,145 @@
+import re
+from collections.abc import Iterator
+from hack_assembler.constants import MNEMONICS
+from hack_assembler.tokens import Token, TokenType
+from hack_assembler.errors import LexerError
+
+
+_SYMBOL_CHAR = r'[\w.$:]'
+"""Same character class as `Lexer._is_valid_subsequent_symbol_char`"""
+
+
+def _mnemonic_alternatives() -> list[tuple[str, str | None]]:
+    """
+    List every mnemonic `Lexer.get_next_token` can produce, with the lookahead
+    that must not follow it, in its priority order: 3-char, 2-char, then 1-char.
+    """
+    alternatives: list[tuple[str, str | None]] = []
+    for mnemonic in sorted(m for m in MNEMONICS if len(m) == 3):
+        if mnemonic[0] in 'AMD' and mnemonic[1] in '+-|&' and mnemonic[2] in '1AMD':
+            # An operator expression is a mnemonic no matter what follows it
+            alternatives.append((mnemonic, None))
+        else:
+            alternatives.append((mnemonic, _SYMBOL_CHAR))
+
+    alternatives += [(f'-{c}', None) for c in '1AMD']
+    alternatives += [(f'!{c}', None) for c in 'AMD']
+    alternatives += [(m, _SYMBOL_CHAR) for m in ['AM', 'AD', 'MD']]
+    alternatives += [(c, r'\d') for c in '01']
+    alternatives += [(c, _SYMBOL_CHAR) for c in 'AMD']
+    return alternatives
+
+
+def _mnemonic_pattern() -> str:
+    """
+    Factor the mnemonic alternatives by their first character so that the regex
+    engine only tries the few alternatives that can match at a position.
+
+    Alternatives with different first characters are mutually exclusive,
+    so only the order inside each group matters and it is preserved.
+    """
+    groups: dict[str, list[str]] = {}
+    for mnemonic, lookahead in _mnemonic_alternatives():
+        rest = re.escape(mnemonic[1:])
+        groups.setdefault(mnemonic[0], []).append(
+            rest if lookahead is None else f'{rest}(?!{lookahead})')
+
+    return '|'.join(f'{re.escape(first)}(?:{'|'.join(rests)})'
+                    for first, rests in groups.items())
+
+
+_TOKEN_REGEX = re.compile(
+    r'(\n)'                                   # 1: end of line
+    r'|([^\S\n]+|//[^\n]*)'                   # 2: white spaces and comments
+    r'|(@)'                                   # 3
+    r'|(\()'                                  # 4
+    r'|(\))'                                  # 5
+    r'|(=)'                                   # 6
+    r'|(;)'                                   # 7
+    r'|(?<=@)(\d+)'                           # 8: integer right after `@`
+    f'|({_mnemonic_pattern()})'               # 9
+    f'|((?:[^\\W\\d]|[.$:]){_SYMBOL_CHAR}*)'  # 10: symbol
+    r'|(.)'                                   # 11: unexpected character
+)
+
+_GROUP_TOKEN_TYPES: tuple[TokenType | None, ...] = (
+    None,
+    TokenType.EOL,
+    None,
+    TokenType.AT_SIGN,
+    TokenType.LPAREN,
+    TokenType.RPAREN,
+    TokenType.EQUAL_SIGN,
+    TokenType.SEMICOLON,
+    TokenType.INTEGER,
+    TokenType.MNEMONIC,
+    TokenType.SYMBOL,
+    None,
+)
+"""Token type of each capture group of `_TOKEN_REGEX`, indexed by group number"""
+
+_ERROR_GROUP = len(_GROUP_TOKEN_TYPES) - 1
+
+
+class RegexLexer(object):
+    """
+    Single-pass tokenizer driven by one compiled master regex.
+
+    It produces the same token stream (including line and column)
+    as `Lexer` but matches a whole token per step instead of
+    walking the source one character at a time.
+
+    **line** is the line number of the first line of **text**, so that
+    a fragment of a bigger source reports its original positions.
+    """
+
+    def __init__(self, text: str, line: int = 1):
+        self._text = text
+        self._first_line = line
+        self._tokens: Iterator[Token] = self._scan()
+
+    def get_next_token(self) -> Token:
+        """
+        Lexical analyzer (also known as scanner or tokenizer)
+
+        This method is responsible for breaking a sentence
+        apart into tokens. One token at a time.
+        """
+        return next(self._tokens)
+
+    def _scan(self) -> Iterator[Token]:
+        text = self._text
+        text_len = len(text)
+        token_types = _GROUP_TOKEN_TYPES
+        eol = TokenType.EOL
+        integer = TokenType.INTEGER
+
+        line = self._first_line
+        line_start = 0
+        """Index of the first character of the current line"""
+
+        # Every character belongs to some group, so the matches tile the whole text
+        for m in _TOKEN_REGEX.finditer(text):
+            group = m.lastindex
+            if group == _ERROR_GROUP:
+                pos = m.start()
+                raise LexerError(
+                    message=f'Lexer error on character \'{text[pos]}\' at line {line}, column {pos - line_start + 1}'
+                )
+
+            token_type = token_types[group]
+            if token_type is not None:
+                value = m[group]
+                yield Token(token_type,
+                            int(value) if token_type is integer else value,
+                            line,
+                            m.start() - line_start + 1)
+                if token_type is eol:
+                    line += 1
+                    line_start = m.end()
+
+        while True:
+            yield Token(type=TokenType.EOF,
+                        value='',
+                        line=line,
+                        column=text_len - line_start)
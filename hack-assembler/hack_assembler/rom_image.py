@@ -0,0 +1,108 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+from itertools import islice
+from pathlib import Path
+from typing import BinaryIO, Literal
+from hack_assembler.errors import Error
+
+MAGIC = b'HACK'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBBHI')
+"""magic, version, byte order of the words (0: little, 1: big), reserved, word count"""
+
+HEADER_SIZE = _HEADER.size
+
+ByteOrder = Literal['little', 'big']
+
+_BYTE_ORDER_FLAGS: dict[str, int] = {'little': 0, 'big': 1}
+
+
+def write_rom_image(words: Iterable[int],
+                    outfile: BinaryIO,
+                    byteorder: ByteOrder = 'little',
+                    chunk_size: int = 4096) -> int:
+    """
+    Write machine words to **outfile** as a binary ROM image: a small header
+    followed by the packed 16-bit words.
+
+    Words are packed **chunk_size** at a time; the word count is patched
+    into the header at the end, so **outfile** must be seekable.
+
+    Returns the number of written words.
+    """
+    start = outfile.tell()
+    outfile.write(_HEADER.pack(MAGIC, VERSION, _BYTE_ORDER_FLAGS[byteorder], 0, 0))
+
+    swap = byteorder != sys.byteorder
+    it = iter(words)
+    count = 0
+    while True:
+        chunk = array('H', islice(it, chunk_size))
+        if not chunk:
+            break
+        if swap:
+            chunk.byteswap()
+        outfile.write(chunk.tobytes())
+        count += len(chunk)
+
+    end = outfile.tell()
+    outfile.seek(start)
+    outfile.write(_HEADER.pack(MAGIC, VERSION, _BYTE_ORDER_FLAGS[byteorder], 0, count))
+    outfile.seek(end)
+    return count
+
+
+class RomImage(object):
+    """
+    Memory-mapped binary ROM image.
+
+    When the image was written in the native byte order, **words** is a
+    zero-copy view on the mapped file; otherwise it is a byte-swapped copy.
+    """
+
+    def __init__(self, path: str | Path):
+        with open(path, 'rb') as f:
+            # Checked before mapping: an empty file cannot be mapped at all
+            if os.fstat(f.fileno()).st_size < HEADER_SIZE:
+                raise Error(f'Invalid hack ROM image: {path}')
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, byteorder_flag, _, count = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION or byteorder_flag not in _BYTE_ORDER_FLAGS.values() \
+                or len(self._mmap) < HEADER_SIZE + 2 * count:
+            self.close()
+            raise Error(f'Invalid hack ROM image: {path}')
+
+        self.byteorder: ByteOrder = 'little' if byteorder_flag == 0 else 'big'
+        self._view = memoryview(self._mmap)[HEADER_SIZE:HEADER_SIZE + 2 * count].cast('H')
+
+        self.words: memoryview | array
+        if self.byteorder == sys.byteorder:
+            self.words = self._view
+        else:
+            self.words = array('H', self._view)
+            self.words.byteswap()
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def close(self) -> None:
+        view: memoryview | None = getattr(self, '_view', None)
+        if view is not None:
+            view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'RomImage':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def load_rom_image(path: str | Path) -> RomImage:
+    return RomImage(path)
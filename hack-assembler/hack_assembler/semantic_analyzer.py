@@ -19,8 +19,8 @@ class SemanticAnalyzer(NodeVisitor):
         return self._symbol_table
 
     def _visit_ProgramNode(self, node: ProgramNode) -> None:
-        for instruction_node in node.instructions:
-            self._visit(instruction_node)
+        for _ in self._visit_all(node.instructions):
+            pass
 
     def _visit_AInstructionNode(self, node: AInstructionNode) -> None:
         self._current_line += 1
@@ -0,0 +1,56 @@
+from array import array
+from hack_assembler.encoding import word_to_text
+from hack_assembler.errors import DuplicatedSymbolError
+from hack_assembler.fixups import encode_instructions, patch_fixups
+from hack_assembler.lexer import Lexer
+from hack_assembler.parser import Parser
+from hack_assembler.regex_lexer import RegexLexer
+from hack_assembler.symbol_table import SymbolTable, DeclaredSymbol
+
+
+class SinglePassAssembler(object):
+    """
+    Assemble Hack assembly language in a single pass over the parsed
+    instructions, encoding each of them as soon as the parser produces it.
+
+    A reference to a symbol that is not known yet (a label declared
+    further down, or a variable) leaves a placeholder word and a fixup,
+    keyed by its ROM address. Once the input is exhausted every label is
+    known: fixups are patched in ROM order, so the remaining symbols are
+    allocated as variables in order of first use, exactly like
+    `CodeGenerator` does.
+
+    Instruction nodes are dropped right after being encoded, so memory
+    only grows with the machine words and the fixups, not with an AST.
+    """
+
+    def __init__(self, text: str, lexer: str = 'regex'):
+        self._text = text
+        self._lexer = lexer
+        self._symbol_table = SymbolTable()
+
+    def assemble(self) -> str:
+        return '\n'.join(self.generate_machine_codes())
+
+    def generate_machine_codes(self) -> list[str]:
+        return list(map(word_to_text, self.generate_words()))
+
+    def generate_words(self) -> array:
+        words = array('H')
+        fixups: list[tuple[int, str]] = []
+        """ROM address and name of every reference to a symbol unknown when it was encoded"""
+
+        parser = Parser(lexer=(RegexLexer if self._lexer == 'regex' else Lexer)(text=self._text))
+        # Labels are defined right away, so references after them need no fixup
+        encode_instructions(parser.iter_instructions(),
+                            symbol_table=self._symbol_table,
+                            words=words,
+                            fixups=fixups,
+                            declare_label=self._declare_label)
+        patch_fixups(words, fixups, self._symbol_table)
+        return words
+
+    def _declare_label(self, name: str, address: int) -> None:
+        if self._symbol_table.lookup(name) is not None:
+            raise DuplicatedSymbolError(name)
+        self._symbol_table.define(DeclaredSymbol(name=name, value=address))
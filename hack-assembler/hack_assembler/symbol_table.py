@@ -1,6 +1,9 @@
 from abc import ABC
 from collections import OrderedDict
 
+FIRST_VARIABLE_ADDRESS = 16
+"""RAM address of the first variable, right after the R0-R15 registers"""
+
 
 class Symbol(ABC):
     def __init__(self, name: str, value: int):
@@ -19,6 +22,7 @@ class DeclaredSymbol(Symbol):
 class SymbolTable(object):
     def __init__(self):
         self._symbols: dict[str, Symbol] = OrderedDict()
+        self._allocatable_mem_ptr = FIRST_VARIABLE_ADDRESS
         self._init_builtin_symbols()
 
     def define(self, symbol: DeclaredSymbol) -> None:
@@ -27,6 +31,28 @@ class SymbolTable(object):
     def lookup(self, name: str) -> Symbol | None:
         return self._symbols.get(name)
 
+    def resolve(self, name: str) -> Symbol:
+        """
+        Look **name** up, allocating it as a variable if it is not defined
+        """
+        symbol = self._symbols.get(name)
+        if symbol is None:
+            symbol = self.allocate_variable(name)
+        return symbol
+
+    def allocate_variable(self, name: str) -> DeclaredSymbol:
+        """
+        Define **name** at the next free RAM address, so that variables
+        get consecutive addresses in order of allocation
+        """
+        symbol = DeclaredSymbol(name=name, value=self._allocatable_mem_ptr)
+        self._allocatable_mem_ptr += 1
+        self.define(symbol)
+        return symbol
+
+    def remove(self, name: str) -> None:
+        self._symbols.pop(name, None)
+
     def _init_builtin_symbols(self) -> None:
         for i in range(0, 16):
             self.define(DeclaredSymbol(f'R{i}', i))
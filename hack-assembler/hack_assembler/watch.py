@@ -0,0 +1,95 @@
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from hack_assembler.incremental import IncrementalAssembler
+from hack_assembler.pipeline import write_words
+from hack_assembler.rom_image import ByteOrder
+
+
+def add_watch_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--watch", action='store_true',
+                        help="Keep running and re-assemble incrementally whenever an input file changes")
+    parser.add_argument("--interval", type=float, default=0.2,
+                        help="Polling interval of the watch mode, in seconds")
+
+
+class Watcher(object):
+    """
+    Poll input files and re-assemble them in-process when they change.
+
+    Each file keeps a warm `IncrementalAssembler`, so a change only
+    re-parses the edited lines instead of paying interpreter startup,
+    imports and a cold assembly.
+    """
+
+    def __init__(self,
+                 targets: list[tuple[Path, Path]],
+                 format: str = 'text',
+                 byteorder: ByteOrder = 'little',
+                 interval: float = 0.2):
+        self._targets = targets
+        """Input and output path of each watched file"""
+        self._format = format
+        self._byteorder = byteorder
+        self._interval = interval
+
+        self._assemblers: dict[Path, IncrementalAssembler] = {}
+        self._stamps: dict[Path, tuple[int, int] | None] = {}
+
+    def run(self) -> None:
+        print(f'Watching {len(self._targets)} file(s), press Ctrl+C to stop', flush=True)
+        try:
+            while True:
+                self.poll()
+                time.sleep(self._interval)
+        except KeyboardInterrupt:
+            pass
+
+    def poll(self) -> int:
+        """
+        Rebuild every file changed since the last poll.
+
+        Returns the number of rebuilt files.
+        """
+        rebuilt = 0
+        for input_file_path, output_file_path in self._targets:
+            stamp = self._stamp(input_file_path)
+            if stamp is None or stamp == self._stamps.get(input_file_path):
+                continue
+            self._stamps[input_file_path] = stamp
+            self.rebuild(input_file_path, output_file_path)
+            rebuilt += 1
+        return rebuilt
+
+    def rebuild(self, input_file_path: Path, output_file_path: Path) -> None:
+        start = time.perf_counter()
+        try:
+            text = input_file_path.read_text()
+            assembler = self._assemblers.get(input_file_path)
+            if assembler is None:
+                assembler = IncrementalAssembler(text=text)
+                self._assemblers[input_file_path] = assembler
+                encoded = len(assembler.generate_words())
+            else:
+                encoded = assembler.update(text)
+
+            write_words(assembler.generate_words(),
+                        output_file_path,
+                        format=self._format,
+                        byteorder=self._byteorder)
+        except Exception as e:
+            print(f'[{(time.perf_counter() - start) * 1000:9.2f} ms] {input_file_path} FAILED {type(e).__name__}: {e}',
+                  file=sys.stderr, flush=True)
+            return
+
+        print(f'[{(time.perf_counter() - start) * 1000:9.2f} ms] {input_file_path} -> {output_file_path} '
+              f'({encoded} words encoded)', flush=True)
+
+    def _stamp(self, path: Path) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,26 @@
+from collections.abc import Iterable
+from itertools import islice
+from typing import TextIO
+
+
+def write_machine_codes(machine_codes: Iterable[str], outfile: TextIO, chunk_size: int = 4096) -> int:
+    """
+    Stream **machine_codes** to **outfile** as a `.hack` file, one word per line.
+
+    Words are joined and written **chunk_size** at a time, so memory use stays
+    bounded whatever the program size and writing starts with the first chunk.
+    The output is identical to `'\\n'.join(machine_codes)`.
+
+    Returns the number of written words.
+    """
+    words = iter(machine_codes)
+    count = 0
+    while True:
+        chunk = list(islice(words, chunk_size))
+        if not chunk:
+            return count
+
+        if count > 0:
+            outfile.write('\n')
+        outfile.write('\n'.join(chunk))
+        count += len(chunk)
@@ -0,0 +1,38 @@
+import unittest
+from pathlib import Path
+from hack_assembler.disassembler import load_words
+from hack_assembler.pipeline import assemble
+
+PROJECT_DIRECTORY = Path(__file__).resolve().parents[2] / 'projects' / '06'
+
+PROGRAMS = ['Add', 'Max', 'MaxL', 'Rect', 'RectL', 'Pong', 'PongL']
+
+MODES = {
+    'normal': {},
+    'char lexer': {'lexer': 'char'},
+    'fast': {'fast': True},
+    'single pass': {'single_pass': True},
+    'single pass, char lexer': {'single_pass': True, 'lexer': 'char'},
+    'one chunk': {'chunks': 1},
+    'chunked': {'chunks': 3},
+}
+
+
+class AssemblerParityTest(unittest.TestCase):
+    def test_every_mode_matches_reference_machine_code(self):
+        for program in PROGRAMS:
+            text = (PROJECT_DIRECTORY / f'{program}.asm').read_text()
+            expected = list(load_words(PROJECT_DIRECTORY / f'{program}.hack'))
+            for mode, options in MODES.items():
+                with self.subTest(program=program, mode=mode):
+                    self.assertEqual(list(assemble(text, **options)), expected)
+
+    def test_variables_are_allocated_in_order_of_first_use(self):
+        text = '@i\n@sum\n(LOOP)\n@i\n@LOOP\n@R2\n@other\n@END\n(END)\n'
+        for mode, options in MODES.items():
+            with self.subTest(mode=mode):
+                self.assertEqual(list(assemble(text, **options)), [16, 17, 16, 2, 2, 18, 7])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import argparse
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from hack_assembler.cache import CACHE_ENVIRONMENT_VARIABLE, BuildCache
+from hack_assembler.pipeline import add_assembly_arguments, assemble_file, cache_from_args
+
+
+def parse_args(*argv: str) -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    add_assembly_arguments(parser)
+    return parser.parse_args(argv)
+
+
+class CacheFromArgsTest(unittest.TestCase):
+    def setUp(self):
+        # Never let a test fall back to the real ~/.cache
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        environ = {key: value for key, value in os.environ.items() if key != CACHE_ENVIRONMENT_VARIABLE}
+        environ['XDG_CACHE_HOME'] = self.tmp.name
+        patcher = mock.patch.dict(os.environ, environ, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_off_by_default(self):
+        self.assertIsNone(cache_from_args(parse_args()))
+
+    def test_enabled_by_flag(self):
+        cache = cache_from_args(parse_args('--cache'))
+        self.assertIsInstance(cache, BuildCache)
+        self.assertEqual(cache.directory, Path(self.tmp.name) / 'hack-assembler')
+
+    def test_enabled_by_cache_dir(self):
+        cache = cache_from_args(parse_args('--cache-dir', self.tmp.name))
+        self.assertEqual(cache.directory, Path(self.tmp.name))
+
+    def test_enabled_by_environment(self):
+        os.environ[CACHE_ENVIRONMENT_VARIABLE] = '1'
+        self.assertIsInstance(cache_from_args(parse_args()), BuildCache)
+        self.assertIsNone(cache_from_args(parse_args('--no-cache')))
+
+        os.environ[CACHE_ENVIRONMENT_VARIABLE] = '0'
+        self.assertIsNone(cache_from_args(parse_args()))
+
+
+class BuildCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory = Path(self.tmp.name)
+
+    def test_hit_gives_same_output(self):
+        source = self.directory / 'Prog.asm'
+        source.write_text('@i\nM=1\n(LOOP)\n@LOOP\n0;JMP\n')
+        cache = BuildCache(directory=self.directory / 'cache')
+
+        assemble_file(source, self.directory / 'miss.hack', cache=cache)
+        self.assertEqual(len(list(cache.directory.iterdir())), 1)
+        assemble_file(source, self.directory / 'hit.hack', cache=cache)
+
+        self.assertEqual((self.directory / 'hit.hack').read_text(), (self.directory / 'miss.hack').read_text())
+
+    def test_eviction(self):
+        cache = BuildCache(directory=self.directory, max_size=4)
+        cache.put(cache.key('@1'), [1, 2])
+        (entry,) = self.directory.iterdir()
+        os.utime(entry, (0, 0))
+        cache.put(cache.key('@2'), [3, 4])
+
+        self.assertIsNone(cache.get(cache.key('@1')))
+        self.assertEqual(list(cache.get(cache.key('@2'))), [3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
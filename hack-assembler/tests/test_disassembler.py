@@ -0,0 +1,40 @@
+import tempfile
+import unittest
+from pathlib import Path
+from hack_assembler.disassembler import Disassembler, load_words
+from hack_assembler.errors import Error
+from hack_assembler.pipeline import assemble
+
+PROJECT_DIRECTORY = Path(__file__).resolve().parents[2] / 'projects' / '06'
+
+PROGRAMS = ['Add', 'Max', 'Rect', 'Pong']
+
+
+class DisassemblerTest(unittest.TestCase):
+    def test_disassembly_assembles_back_to_same_words(self):
+        for program in PROGRAMS:
+            words = load_words(PROJECT_DIRECTORY / f'{program}.hack')
+            for labels in (False, True):
+                with self.subTest(program=program, labels=labels):
+                    text = Disassembler(words=words, labels=labels).disassemble()
+                    self.assertEqual(list(assemble(text)), list(words))
+
+    def test_labels_are_declared_at_jump_targets(self):
+        words = list(assemble('@2\n0;JMP\n(LOOP)\n@LOOP\n0;JMP\n'))
+        self.assertEqual(Disassembler(words=words, labels=True).disassemble().split('\n'),
+                         ['@L2', '0;JMP', '(L2)', '@L2', '0;JMP'])
+
+    def test_invalid_word_is_rejected(self):
+        with self.assertRaisesRegex(Error, 'at ROM address 1'):
+            Disassembler(words=[0, 0b1000000000000000]).disassemble()
+
+    def test_malformed_line_is_rejected(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'Prog.hack'
+            path.write_text('0000000000000010\n111011000001000\n')
+            with self.assertRaisesRegex(Error, 'at line 2'):
+                load_words(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
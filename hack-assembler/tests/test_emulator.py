@@ -0,0 +1,59 @@
+import unittest
+from pathlib import Path
+from hack_assembler.disassembler import load_words
+from hack_assembler.emulator.cpu import HackCPU, signed
+from hack_assembler.pipeline import assemble
+
+PROJECT_DIRECTORY = Path(__file__).resolve().parents[2] / 'projects' / '06'
+
+SCREEN = 16384
+
+MAX_INSTRUCTIONS = 100_000
+
+
+def run(program: str, ram: dict[int, int]) -> HackCPU:
+    cpu = HackCPU(rom=load_words(PROJECT_DIRECTORY / f'{program}.hack'))
+    for address, value in ram.items():
+        cpu.ram[address] = value & 0xFFFF
+    cpu.run(MAX_INSTRUCTIONS)
+    return cpu
+
+
+class EmulatorTest(unittest.TestCase):
+    def test_add(self):
+        cpu = run('Add', {})
+        self.assertTrue(cpu.halted)
+        self.assertEqual(cpu.ram[0], 5)
+
+    def test_max(self):
+        for first, second in ((3, 5), (5, 3), (-7, -2), (-2, -7), (4, 4)):
+            with self.subTest(first=first, second=second):
+                cpu = run('Max', {0: first, 1: second})
+                self.assertTrue(cpu.halted)
+                self.assertEqual(signed(cpu.ram[2]), max(first, second))
+
+    def test_rect(self):
+        for height in (0, 1, 4):
+            with self.subTest(height=height):
+                cpu = run('Rect', {0: height})
+                self.assertTrue(cpu.halted)
+                rows = [cpu.ram[SCREEN + 32 * row] for row in range(6)]
+                self.assertEqual(rows, [0xFFFF] * height + [0] * (6 - height))
+                self.assertEqual(cpu.ram[SCREEN + 1], 0)
+
+    def test_arithmetic_wraps_around(self):
+        cpu = HackCPU(rom=assemble('@32767\nD=A\nD=D+1\n@R0\nM=D\nM=M-1\n@R1\nM=-1\nM=M+1\n(END)\n@END\n0;JMP\n'))
+        cpu.run(MAX_INSTRUCTIONS)
+        self.assertTrue(cpu.halted)
+        self.assertEqual(cpu.ram[0], 32767)
+        self.assertEqual(cpu.ram[1], 0)
+
+    def test_runs_text_machine_code(self):
+        lines = [f'{word:016b}' for word in load_words(PROJECT_DIRECTORY / 'Add.hack')]
+        cpu = HackCPU(rom=lines)
+        cpu.run(MAX_INSTRUCTIONS)
+        self.assertEqual(cpu.ram[0], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+from hack_assembler.disassembler import load_words
+from hack_assembler.errors import DuplicatedSymbolError, Error
+from hack_assembler.linker import Linker
+from hack_assembler.object_file import assemble_object, assemble_object_file, load_object_file
+from hack_assembler.pipeline import assemble
+
+PROJECT_DIRECTORY = Path(__file__).resolve().parents[2] / 'projects' / '06'
+
+
+class ObjectFileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory = Path(self.tmp.name)
+
+    def write_object(self, name: str, text: str) -> Path:
+        source = self.directory / f'{name}.asm'
+        source.write_text(text)
+        output = self.directory / f'{name}.hobj'
+        assemble_object_file(source, output)
+        return output
+
+    def test_write_load_round_trip(self):
+        text = (PROJECT_DIRECTORY / 'Pong.asm').read_text()
+        obj = assemble_object(text)
+        loaded = load_object_file(self.write_object('Pong', text))
+        self.assertEqual(list(loaded.words), list(obj.words))
+        self.assertEqual(loaded.relocations, obj.relocations)
+        self.assertEqual(loaded.exports, obj.exports)
+        self.assertEqual(loaded.imports, obj.imports)
+
+    def test_linking_one_object_gives_assembled_program(self):
+        for program in ('Max', 'Rect', 'Pong'):
+            with self.subTest(program=program):
+                obj = load_object_file(self.write_object(program, (PROJECT_DIRECTORY / f'{program}.asm').read_text()))
+                self.assertEqual(list(Linker(objects=[obj]).generate_words()),
+                                 list(load_words(PROJECT_DIRECTORY / f'{program}.hack')))
+
+    def test_linking_gives_concatenated_sources(self):
+        sources = {
+            'Main': '@counter\nM=1\n@Lib.inc\n0;JMP\n(Main.back)\n@Main.back\n0;JMP\n',
+            'Lib': '(Lib.inc)\n@counter\nM=M+1\n@scratch\nM=0\n@Main.back\n0;JMP\n',
+        }
+        objects = [load_object_file(self.write_object(name, text)) for name, text in sources.items()]
+        self.assertEqual(list(Linker(objects=objects).generate_words()),
+                         list(assemble(''.join(sources.values()))))
+
+    def test_duplicated_export_is_rejected(self):
+        objects = [assemble_object('(LOOP)\n@LOOP\n0;JMP\n'), assemble_object('(LOOP)\n@LOOP\n0;JMP\n')]
+        with self.assertRaises(DuplicatedSymbolError):
+            Linker(objects=objects).generate_words()
+
+    def test_invalid_object_file_is_rejected(self):
+        path = self.directory / 'Invalid.hobj'
+        path.write_bytes(b'HACK')
+        with self.assertRaisesRegex(Error, 'Invalid hack object file'):
+            load_object_file(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from hack_assembler.errors import ValueOutOfRangeError
+from hack_assembler.pipeline import assemble_file
+
+OUT_OF_RANGE_SOURCE = '@1\nD=A\n' * 1000 + '@40000\nD=A\n'
+
+
+class AssembleFileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory = Path(self.tmp.name)
+        self.source = self.directory / 'Prog.asm'
+        self.source.write_text(OUT_OF_RANGE_SOURCE)
+
+    def assert_no_temporary_file(self):
+        self.assertEqual([p.name for p in self.directory.iterdir() if p.suffix == '.tmp'], [])
+
+    def test_error_leaves_no_output_file(self):
+        for format in ('text', 'bin'):
+            with self.subTest(format=format):
+                output = self.directory / f'Prog.{format}'
+                with self.assertRaises(ValueOutOfRangeError):
+                    assemble_file(self.source, output, format=format)
+                self.assertFalse(output.exists())
+                self.assert_no_temporary_file()
+
+    def test_error_leaves_previous_output_unchanged(self):
+        output = self.directory / 'Prog.hack'
+        output.write_text('0000000000000111\n')
+        with self.assertRaises(ValueOutOfRangeError):
+            assemble_file(self.source, output)
+        self.assertEqual(output.read_text(), '0000000000000111\n')
+        self.assert_no_temporary_file()
+
+    def test_success_replaces_output(self):
+        output = self.directory / 'Prog.hack'
+        output.write_text('0000000000000111\n')
+        self.source.write_text('@2\nD=A\n')
+        assemble_file(self.source, output)
+        self.assertEqual(output.read_text().split(), ['0000000000000010', '1110110000010000'])
+        self.assert_no_temporary_file()
+
+
+class ImportTest(unittest.TestCase):
+    def test_single_file_assembly_does_not_load_process_pool(self):
+        code = ('import sys, hack_assembler.main; '
+                'print(sorted({"multiprocessing", "concurrent.futures.process"} & set(sys.modules)))')
+        output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+        self.assertEqual(output.strip(), '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from hack_assembler.errors import Error
+from hack_assembler.rom_image import HEADER_SIZE, load_rom_image, write_rom_image
+
+
+class RomImageTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / 'Prog.bin'
+
+    def write_image(self, words: list[int], byteorder: str) -> None:
+        buffer = io.BytesIO()
+        write_rom_image(words, buffer, byteorder=byteorder)
+        self.path.write_bytes(buffer.getvalue())
+
+    def test_round_trip(self):
+        for byteorder in ('little', 'big'):
+            with self.subTest(byteorder=byteorder):
+                self.write_image([0, 7, 0xEC10, 0xFFFF], byteorder)
+                with load_rom_image(self.path) as image:
+                    self.assertEqual(image.byteorder, byteorder)
+                    self.assertEqual(list(image.words), [0, 7, 0xEC10, 0xFFFF])
+
+    def test_empty_file_is_invalid(self):
+        self.path.write_bytes(b'')
+        with self.assertRaisesRegex(Error, 'Invalid hack ROM image'):
+            load_rom_image(self.path)
+
+    def test_truncated_file_is_invalid(self):
+        self.write_image([1, 2, 3], 'little')
+        self.path.write_bytes(self.path.read_bytes()[:HEADER_SIZE + 4])
+        with self.assertRaisesRegex(Error, 'Invalid hack ROM image'):
+            load_rom_image(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
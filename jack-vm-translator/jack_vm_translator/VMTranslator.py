@@ -1,10 +1,91 @@
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import cast
+from typing import List, Optional, Tuple
 from _errors import Error
-from _lexer import Lexer
-from _parser import Parser
-from _code_gen import CodeGenerator
+from _instruction import Instruction, to_asm_code
+from _linker import ENTRY_FUNCTION, allocate_statics, link, static_usage_report
+from _translator import BACKENDS, Translation, translate_file
+
+
+def translate_files(input_file_paths: List[str],
+                    backend_name: str = 'stack',
+                    opt: bool = False,
+                    shared_comparisons: bool = False,
+                    jobs: Optional[int] = None) -> List[Translation]:
+    """
+    Translate each file in a worker process, keeping the order of **input_file_paths**
+    """
+    if len(input_file_paths) == 1 or jobs == 1:
+        return [translate_file(path, backend_name, opt, shared_comparisons) for path in input_file_paths]
+
+    n = len(input_file_paths)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(translate_file,
+                                 input_file_paths,
+                                 [backend_name] * n,
+                                 [opt] * n,
+                                 [shared_comparisons] * n))
+
+
+def add_translation_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Register the options shared by the vm translator and vm2hack command lines
+    """
+    parser.add_argument("input", help="Path to input file, or to a directory of input files")
+    parser.add_argument("--opt", action='store_true',
+                        help="Optimize the generated assembly and report the instruction count reduction")
+    parser.add_argument("--shared-comparisons", action='store_true',
+                        help="Call one shared routine per eq/gt/lt instead of expanding each comparison inline, "
+                             "and report the size/cycle trade-off")
+    parser.add_argument("--backend", choices=list(BACKENDS), default='stack',
+                        help="Code generation strategy: `stack` keeps the whole stack in RAM, "
+                             "`tos` keeps the top of the stack in the D register")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Number of worker processes translating the files of a directory (default: CPU count)")
+    parser.add_argument("--no-bootstrap", action='store_true',
+                        help=f"Do not start a directory program by calling {ENTRY_FUNCTION}")
+    parser.add_argument("--report-statics", action='store_true',
+                        help="Report the static memory allocated to each file")
+
+
+def translate_from_args(args: argparse.Namespace) -> Tuple[Path, List[Instruction]]:
+    """
+    Translate and link the file or directory given on the command line.
+
+    Returns the output path without extension and the linked instructions.
+    """
+    input_path = Path(args.input)
+
+    if input_path.is_dir():
+        # Sorted so that the output does not depend on the file system
+        input_file_paths = [str(p) for p in sorted(input_path.glob('*.vm'))]
+        if not input_file_paths:
+            raise Error(f'No Jack vm bytecode file in directory: {input_path}')
+        output_path = input_path / input_path.resolve().name
+    elif input_path.suffix == '.vm':
+        input_file_paths = [str(input_path)]
+        output_path = input_path.with_suffix('')
+    else:
+        raise Error(f'Invalid Jack vm bytecode file: {input_path}')
+
+    translations = translate_files(input_file_paths,
+                                   backend_name=args.backend,
+                                   opt=args.opt,
+                                   shared_comparisons=args.shared_comparisons,
+                                   jobs=args.jobs)
+    for translation in translations:
+        for report in translation.reports:
+            print(report)
+
+    if args.report_statics:
+        for line in static_usage_report(translations, allocate_statics(translations)):
+            print(line)
+
+    bootstrap = input_path.is_dir() \
+        and not args.no_bootstrap \
+        and any(ENTRY_FUNCTION in translation.functions for translation in translations)
+    return output_path, link(translations, bootstrap=bootstrap)
 
 
 def main() -> None:
@@ -13,30 +94,13 @@ def main() -> None:
     """
     parser = argparse.ArgumentParser(
         description="Simple Jack vm translator.")
-    parser.add_argument("input", help="Path to input file")
+    add_translation_arguments(parser)
     args = parser.parse_args()
 
-    input_file_path = args.input
-
-    if not cast(str, input_file_path).endswith('.vm'):
-        raise Error(f'Invalid Jack vm bytecode file: {input_file_path}')
-
-    output_file_path = cast(str, input_file_path).replace(".vm", ".asm")
-
-    with open(Path(input_file_path).resolve(), "r") as infile:
-        vm_code = infile.read()
-
-        lexer = Lexer(text=vm_code)
-        # token = lexer.get_next_token()
-        # while token.type != TokenType.EOF:
-        #     print(token)
-        #     token = lexer.get_next_token()
-        parser = Parser(lexer=lexer)
-        # print(parser.parse())
-        code_generator = CodeGenerator(ast=parser.parse())
+    output_path, instructions = translate_from_args(args)
 
-        with open(Path(output_file_path).resolve(), "w") as outfile:
-            outfile.write(code_generator.generate_asm_code())
+    with open(output_path.with_name(f'{output_path.name}.asm').resolve(), "w") as outfile:
+        outfile.write(to_asm_code(instructions))
 
 
 if __name__ == "__main__":
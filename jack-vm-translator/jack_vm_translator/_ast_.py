@@ -1,4 +1,3 @@
-from abc import ABC
 from enum import Enum
 from typing import List
 from _token import Token
@@ -8,17 +7,24 @@ class AstNodeType(Enum):
     PROGRAM = "PROGRAM"
     STACK_COMMAND = 'STACK_COMMAND'
     ARITH_LOGIC_COMMAND = 'ARITH_LOGIC_COMMAND'
+    FLOW_COMMAND = 'FLOW_COMMAND'
+    FUNCTION_COMMAND = 'FUNCTION_COMMAND'
+    CALL_COMMAND = 'CALL_COMMAND'
+    RETURN_COMMAND = 'RETURN_COMMAND'
 
     MEM_SEGMENT = "MEM_SEGMENT"
 
 
-class AstNode(ABC):
+class AstNode(object):
+    __slots__ = ('type',)
+
     def __init__(self, type: AstNodeType) -> None:
-        super().__init__()
         self.type = type
 
 
 class MemSegmentNode(AstNode):
+    __slots__ = ('segment', 'idx')
+
     def __init__(self, segment: Token, idx: Token) -> None:
         super().__init__(type=AstNodeType.MEM_SEGMENT)
         self.segment = segment
@@ -29,6 +35,8 @@ class MemSegmentNode(AstNode):
 
 
 class CmdNode(AstNode):
+    __slots__ = ('cmd',)
+
     def __init__(self, type: AstNodeType, cmd: Token):
         super().__init__(type=type)
         self.cmd = cmd
@@ -38,6 +46,8 @@ class CmdNode(AstNode):
 
 
 class StackCmdNode(CmdNode):
+    __slots__ = ('segment',)
+
     def __init__(self, cmd: Token, segment: MemSegmentNode):
         super().__init__(type=AstNodeType.STACK_COMMAND, cmd=cmd)
         self.segment = segment
@@ -47,11 +57,60 @@ class StackCmdNode(CmdNode):
 
 
 class ArithLogicCmdNode(CmdNode):
+    __slots__ = ()
+
     def __init__(self, cmd: Token):
         super().__init__(type=AstNodeType.ARITH_LOGIC_COMMAND, cmd=cmd)
 
 
+class FlowCmdNode(CmdNode):
+    """
+    `label`, `goto` or `if-goto` command
+    """
+    __slots__ = ('label',)
+
+    def __init__(self, cmd: Token, label: Token):
+        super().__init__(type=AstNodeType.FLOW_COMMAND, cmd=cmd)
+        self.label = label
+
+    def __str__(self) -> str:
+        return f'{self.type.value} [{self.cmd.value} {self.label.value}]'
+
+
+class FunctionCmdNode(CmdNode):
+    __slots__ = ('name', 'n_vars')
+
+    def __init__(self, cmd: Token, name: Token, n_vars: Token):
+        super().__init__(type=AstNodeType.FUNCTION_COMMAND, cmd=cmd)
+        self.name = name
+        self.n_vars = n_vars
+
+    def __str__(self) -> str:
+        return f'{self.type.value} [{self.name.value} {self.n_vars.value}]'
+
+
+class CallCmdNode(CmdNode):
+    __slots__ = ('name', 'n_args')
+
+    def __init__(self, cmd: Token, name: Token, n_args: Token):
+        super().__init__(type=AstNodeType.CALL_COMMAND, cmd=cmd)
+        self.name = name
+        self.n_args = n_args
+
+    def __str__(self) -> str:
+        return f'{self.type.value} [{self.name.value} {self.n_args.value}]'
+
+
+class ReturnCmdNode(CmdNode):
+    __slots__ = ()
+
+    def __init__(self, cmd: Token):
+        super().__init__(type=AstNodeType.RETURN_COMMAND, cmd=cmd)
+
+
 class ProgramNode(AstNode):
+    __slots__ = ('commands',)
+
     def __init__(self, commands: List[AstNode]) -> None:
         super().__init__(type=AstNodeType.PROGRAM)
         self.commands = commands
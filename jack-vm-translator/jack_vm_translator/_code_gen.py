@@ -1,276 +1,542 @@
-from uuid import uuid4
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Set, Tuple
 from _node_visitor import NodeVisitor
-from _ast_ import ProgramNode, ArithLogicCmdNode, StackCmdNode
+from _ast_ import ProgramNode, ArithLogicCmdNode, StackCmdNode, FlowCmdNode, FunctionCmdNode, CallCmdNode, \
+    ReturnCmdNode
 from _constants import VMCommand, VMMemorySegment, SP, THIS, THAT, ARG, LCL
 from _errors import Error
+from _instruction import Instruction, AInstruction, CInstruction, Label, Comment
+
+
+COMPARISON_COMMANDS = [VMCommand.EQ.value, VMCommand.GT.value, VMCommand.LT.value]
+
+ROUTINES_START_SYMBOL = 'VM$START'
+"""Label right after the shared routines"""
+COMPARISON_RETURN_REGISTER = 'R14'
+"""Register keeping the return address while a shared comparison routine runs"""
+
+CALL_ROUTINE_SYMBOL = 'VM$CALL'
+"""Shared routine saving the caller frame and jumping to the callee"""
+RETURN_ROUTINE_SYMBOL = 'VM$RETURN'
+"""Shared routine restoring the caller frame and jumping back to it"""
+
+_JUMP = CInstruction(None, '0', 'JMP')
+"""Unconditional jump to the address held by A"""
+
+
+def static_symbol(file_name: str, idx: int) -> str:
+    """
+    Symbol of the static variable **idx** of a file
+    """
+    return f'{file_name or "Static"}.{idx}'
+
+
+def comparison_routine_symbol(cmd: str) -> str:
+    return f'VM${cmd.upper()}'
+
+
+def gen_comparison_routine(cmd: str) -> List[Instruction]:
+    """
+    Routine popping two values and pushing the result of comparing them
+    with **cmd**, entered with the return address in D.
+    """
+    routine_symbol = comparison_routine_symbol(cmd)
+    jump = {VMCommand.EQ.value: 'JEQ', VMCommand.GT.value: 'JGT', VMCommand.LT.value: 'JLT'}[cmd]
+    return [
+        Label(routine_symbol),
+        AInstruction(COMPARISON_RETURN_REGISTER),
+        CInstruction('M', 'D'),
+        AInstruction(SP),
+        CInstruction('AM', 'M-1'),
+        CInstruction('D', 'M'),
+        CInstruction('A', 'A-1'),
+        CInstruction('D', 'M-D'),
+        CInstruction('M', '-1'),
+        AInstruction(f'{routine_symbol}_TRUE'),
+        CInstruction(None, 'D', jump),
+        AInstruction(SP),
+        CInstruction('A', 'M-1'),
+        CInstruction('M', '0'),
+        Label(f'{routine_symbol}_TRUE'),
+        AInstruction(COMPARISON_RETURN_REGISTER),
+        CInstruction('A', 'M'),
+        _JUMP,
+    ]
+
+
+def gen_call_routine() -> List[Instruction]:
+    """
+    Routine pushing the return address (passed in D) and the frame of
+    the caller, then repositioning ARG and LCL for the callee, whose
+    address is in R13 and number of arguments in R14.
+    """
+    push_d = [
+        AInstruction(SP),
+        CInstruction('AM', 'M+1'),
+        CInstruction('A', 'A-1'),
+        CInstruction('M', 'D'),
+    ]
+    instructions: List[Instruction] = [Label(CALL_ROUTINE_SYMBOL), *push_d]
+    for ptr in [LCL, ARG, THIS, THAT]:
+        instructions.extend([AInstruction(ptr), CInstruction('D', 'M'), *push_d])
+    instructions.extend([
+        AInstruction('R14'),
+        CInstruction('D', 'M'),
+        AInstruction(5),
+        CInstruction('D', 'D+A'),
+        AInstruction(SP),
+        CInstruction('D', 'M-D'),
+        AInstruction(ARG),
+        CInstruction('M', 'D'),
+        AInstruction(SP),
+        CInstruction('D', 'M'),
+        AInstruction(LCL),
+        CInstruction('M', 'D'),
+        AInstruction('R13'),
+        CInstruction('A', 'M'),
+        _JUMP,
+    ])
+    return instructions
+
+
+def gen_return_routine() -> List[Instruction]:
+    """
+    Routine copying the return value to the caller's stack, restoring
+    its frame and jumping back to the saved return address.
+    """
+    instructions: List[Instruction] = [
+        Label(RETURN_ROUTINE_SYMBOL),
+        AInstruction(LCL),
+        CInstruction('D', 'M'),
+        AInstruction('R13'),
+        CInstruction('M', 'D'),
+        AInstruction(5),
+        CInstruction('A', 'D-A'),
+        CInstruction('D', 'M'),
+        AInstruction('R14'),
+        CInstruction('M', 'D'),
+        AInstruction(SP),
+        CInstruction('AM', 'M-1'),
+        CInstruction('D', 'M'),
+        AInstruction(ARG),
+        CInstruction('A', 'M'),
+        CInstruction('M', 'D'),
+        CInstruction('D', 'A+1'),
+        AInstruction(SP),
+        CInstruction('M', 'D'),
+    ]
+    for ptr in [THAT, THIS, ARG, LCL]:
+        instructions.extend([
+            AInstruction('R13'),
+            CInstruction('AM', 'M-1'),
+            CInstruction('D', 'M'),
+            AInstruction(ptr),
+            CInstruction('M', 'D'),
+        ])
+    instructions.extend([
+        AInstruction('R14'),
+        CInstruction('A', 'M'),
+        _JUMP,
+    ])
+    return instructions
+
+
+_ROUTINE_GENERATORS: Dict[str, Callable[[], List[Instruction]]] = {
+    **{comparison_routine_symbol(cmd): partial(gen_comparison_routine, cmd) for cmd in COMPARISON_COMMANDS},
+    CALL_ROUTINE_SYMBOL: gen_call_routine,
+    RETURN_ROUTINE_SYMBOL: gen_return_routine,
+}
+"""Generator of each shared routine, in the order they are emitted"""
+
+
+def gen_routines(symbols: Iterable[str]) -> List[Instruction]:
+    """
+    Shared routines named by **symbols**, in a fixed order
+    """
+    used = set(symbols)
+    return [instruction
+            for symbol, generator in _ROUTINE_GENERATORS.items() if symbol in used
+            for instruction in generator()]
+
+
+def prepend_routines(instructions: List[Instruction], symbols: Iterable[str]) -> List[Instruction]:
+    """
+    Put the shared routines named by **symbols** in front of **instructions**,
+    behind a jump over them
+    """
+    routines = gen_routines(symbols)
+    if not routines:
+        return instructions
+
+    return [
+        Comment('shared routines'),
+        AInstruction(ROUTINES_START_SYMBOL),
+        _JUMP,
+        *routines,
+        Label(ROUTINES_START_SYMBOL),
+        *instructions,
+    ]
+
+
+_PUSH_D: List[Instruction] = [
+    AInstruction(SP),
+    CInstruction('A', 'M'),
+    CInstruction('M', 'D'),
+    AInstruction(SP),
+    CInstruction('M', 'M+1'),
+]
+"""Push the value of D"""
+
+_POP_D: List[Instruction] = [
+    AInstruction(SP),
+    CInstruction('M', 'M-1'),
+    CInstruction('A', 'M'),
+    CInstruction('D', 'M'),
+]
+"""Pop the top of the stack into D"""
+
+_BINARY_COMPS = {
+    VMCommand.ADD.value: 'D+M',
+    VMCommand.SUB.value: 'M-D',
+    VMCommand.AND.value: 'D&M',
+    VMCommand.OR.value: 'D|M',
+}
+
+_COMPARISON_JUMPS = {
+    VMCommand.EQ.value: 'JEQ',
+    VMCommand.GT.value: 'JGT',
+    VMCommand.LT.value: 'JLT',
+}
 
 
 class CodeGenerator(NodeVisitor):
     """
-    Generate Hack assembly from AST of Jack vm bytecode
+    Generate Hack assembly from AST of Jack vm bytecode.
+
+    Each command is translated into a list of `Instruction`, which can
+    be written out as text or handed to the Hack assembler as is.
     """
 
-    def __init__(self, ast: ProgramNode):
+    INLINE_COMPARISON_CYCLES: Tuple[int, int] = (15, 17)
+    """Executed instructions of an inline comparison, when true and when false"""
+    SHARED_COMPARISON_CYCLES: Tuple[int, int] = (17, 20)
+    """Executed instructions of a call to a shared comparison routine, when true and when false"""
+
+    def __init__(self, ast: ProgramNode, file_name: str = '', shared_comparisons: bool = False):
         super().__init__()
         self._ast = ast
 
-    def generate_asm_code(self) -> str:
+        self._file_name = file_name
+        """Name of the translated file, namespacing the generated labels"""
+        self._label_counter: int = 0
+
+        self._shared_comparisons = shared_comparisons
+        """Call one shared routine per comparison command instead of expanding each of them inline"""
+        self._used_routines: Set[str] = set()
+
+        self._current_function: str = ''
+        """Function being translated, scoping the labels declared in it"""
+        self._declared_labels: Set[Tuple[str, str]] = self._collect_labels()
+        """Function and name of every label declared in the file"""
+
+    @property
+    def used_routines(self) -> List[str]:
+        """
+        Symbols of the shared routines called by the translated commands
+        """
+        return [symbol for symbol in _ROUTINE_GENERATORS if symbol in self._used_routines]
+
+    def generate_program(self) -> List[Instruction]:
+        """
+        Translate the commands, preceded by the shared routines they call
+        """
+        return prepend_routines(self.generate_fragment(), self._used_routines)
+
+    def generate_fragment(self) -> List[Instruction]:
+        """
+        Translate the commands alone, without the shared routines they call,
+        so that several translated files can be linked together
+        """
         return self._visit(self._ast)
 
-    def _visit_ProgramNode(self, node: ProgramNode) -> str:
-        machine_codes = ''
-        for cmd in node.commands:
-            c = self._visit(cmd)
-            if c is not None:
-                machine_codes += f'\n{c}'
-        return machine_codes.strip()
+    def _gen_label(self, name: str) -> str:
+        """
+        Generate a label unique within the translated file, the same on every run
+        """
+        label = f'{name}_{self._label_counter}'
+        self._label_counter += 1
+        return f'{self._file_name}${label}' if self._file_name else label
+
+    def _static_symbol(self, idx: int) -> str:
+        """
+        Symbol of the static variable **idx**, private to the translated file
+        """
+        return static_symbol(self._file_name, idx)
+
+    def _gen_comparison_call(self, cmd: str) -> List[Instruction]:
+        """
+        Call the shared routine of comparison **cmd**, emitted in the prologue
+        """
+        self._used_routines.add(comparison_routine_symbol(cmd))
+        RETURN_SYMBOL = self._gen_label(f'{cmd.upper()}_RETURN')
+        return [
+            Comment(cmd),
+            AInstruction(RETURN_SYMBOL),
+            CInstruction('D', 'A'),
+            AInstruction(comparison_routine_symbol(cmd)),
+            _JUMP,
+            Label(RETURN_SYMBOL),
+        ]
+
+    def _collect_labels(self) -> Set[Tuple[str, str]]:
+        """
+        Labels declared in each function, collected before translating so
+        that jumps forward can be checked too
+        """
+        labels: Set[Tuple[str, str]] = set()
+        function = ''
+        for cmd in self._ast.commands:
+            if isinstance(cmd, FunctionCmdNode):
+                function = cmd.name.value
+            elif isinstance(cmd, FlowCmdNode) and cmd.cmd.value == VMCommand.LABEL.value:
+                labels.add((function, cmd.label.value))
+        return labels
 
-    def _visit_ArithLogicCmdNode(self, node: ArithLogicCmdNode) -> str:
+    def _jump_target(self, node: FlowCmdNode) -> str:
+        """
+        Label jumped to by a `goto` or `if-goto`, which must be declared in the current function
+        """
+        label = node.label.value
+        if (self._current_function, label) not in self._declared_labels:
+            scope = f' of function {self._current_function}' if self._current_function else ''
+            raise Error(f'Undeclared label `{label}`{scope} at line {node.label.line}')
+        return self._scoped_label(label)
+
+    def _scoped_label(self, label: str) -> str:
+        """
+        Label **label** declared in the current function
+        """
+        scope = self._current_function or self._file_name
+        return f'{scope}${label}' if scope else label
+
+    def _visit_FlowCmdNode(self, node: FlowCmdNode) -> List[Instruction]:
+        cmd = node.cmd.value
+        comment = Comment(f'{cmd} {node.label.value}')
+        if cmd == VMCommand.LABEL.value:
+            return [comment, Label(self._scoped_label(node.label.value))]
+        label = self._jump_target(node)
+        if cmd == VMCommand.GOTO.value:
+            return [comment, AInstruction(label), _JUMP]
+        return [
+            comment,
+            AInstruction(SP),
+            CInstruction('AM', 'M-1'),
+            CInstruction('D', 'M'),
+            AInstruction(label),
+            CInstruction(None, 'D', 'JNE'),
+        ]
+
+    def _visit_FunctionCmdNode(self, node: FunctionCmdNode) -> List[Instruction]:
+        self._current_function = node.name.value
+        n_vars = node.n_vars.value
+
+        instructions: List[Instruction] = [
+            Comment(f'function {node.name.value} {n_vars}'),
+            Label(node.name.value),
+        ]
+        if n_vars == 0:
+            return instructions
+
+        # Zero the local variables, then move SP past them at once
+        instructions.extend([AInstruction(SP), CInstruction('A', 'M'), CInstruction('M', '0')])
+        for _ in range(n_vars - 1):
+            instructions.extend([CInstruction('A', 'A+1'), CInstruction('M', '0')])
+        instructions.extend([CInstruction('D', 'A+1'), AInstruction(SP), CInstruction('M', 'D')])
+        return instructions
+
+    def _visit_CallCmdNode(self, node: CallCmdNode) -> List[Instruction]:
+        self._used_routines.add(CALL_ROUTINE_SYMBOL)
+        RETURN_SYMBOL = self._gen_label(f'{node.name.value}$ret')
+        return [
+            Comment(f'call {node.name.value} {node.n_args.value}'),
+            AInstruction(node.n_args.value),
+            CInstruction('D', 'A'),
+            AInstruction('R14'),
+            CInstruction('M', 'D'),
+            AInstruction(node.name.value),
+            CInstruction('D', 'A'),
+            AInstruction('R13'),
+            CInstruction('M', 'D'),
+            AInstruction(RETURN_SYMBOL),
+            CInstruction('D', 'A'),
+            AInstruction(CALL_ROUTINE_SYMBOL),
+            _JUMP,
+            Label(RETURN_SYMBOL),
+        ]
+
+    def _visit_ReturnCmdNode(self, node: ReturnCmdNode) -> List[Instruction]:
+        self._used_routines.add(RETURN_ROUTINE_SYMBOL)
+        return [
+            Comment('return'),
+            AInstruction(RETURN_ROUTINE_SYMBOL),
+            _JUMP,
+        ]
+
+    def _visit_ProgramNode(self, node: ProgramNode) -> List[Instruction]:
+        return [instruction
+                for instructions in self._visit_all(node.commands) if instructions is not None
+                for instruction in instructions]
+
+    def _visit_ArithLogicCmdNode(self, node: ArithLogicCmdNode) -> List[Instruction]:
         cmd = node.cmd
         # region Unary arithmetic/logic command
         if cmd.value in [VMCommand.NEG.value, VMCommand.NOT.value]:
-            return f"""
-// {cmd.value}
-@{SP}
-M=M-1
-A=M
-D={'-M' if cmd.value == VMCommand.NEG.value else "!M"}
-@{SP}
-A=M
-M=D
-@{SP}
-M=M+1
-""".strip()
+            return [
+                Comment(cmd.value),
+                AInstruction(SP),
+                CInstruction('M', 'M-1'),
+                CInstruction('A', 'M'),
+                CInstruction('D', '-M' if cmd.value == VMCommand.NEG.value else '!M'),
+                AInstruction(SP),
+                CInstruction('A', 'M'),
+                CInstruction('M', 'D'),
+                AInstruction(SP),
+                CInstruction('M', 'M+1'),
+            ]
         # endregion
 
         # region Binary arithmetic/logic command
-        asm_code = f"""
-// {cmd.value}
-@{SP}
-M=M-1
-A=M
-D=M
-@{SP}
-M=M-1
-A=M
-""".strip()
-
         # region gt, lt, eq
-        if cmd.value in [VMCommand.GT.value, VMCommand.LT.value, VMCommand.EQ.value]:
-            label_id = uuid4()
-            TRUE_BRANCH_SYMBOL = f'{cmd.value.upper()}_TRUE_{label_id}'
-            # FALSE_BRANCH_SYMBOL = f'{cmd.value.upper()}_FALSE_{label_id}'
-            END_BRANCH_SYMBOL = f'{cmd.value.upper()}_END_{label_id}'
-
-            logic_code = ''
-            if cmd.value == VMCommand.GT.value:
-                logic_code = f"""
-D=M-D
-@{TRUE_BRANCH_SYMBOL}
-D;JGT
-""".strip()
-            elif cmd.value == VMCommand.LT.value:
-                logic_code = f"""
-D=M-D
-@{TRUE_BRANCH_SYMBOL}
-D;JLT
-""".strip()
-            else:
-                logic_code = f"""
-D=M-D
-@{TRUE_BRANCH_SYMBOL}
-D;JEQ
-""".strip()
-
-            return f"""
-{asm_code}
-{logic_code}
-@{SP}
-A=M
-M=0
-@{END_BRANCH_SYMBOL}
-0;JMP
-({TRUE_BRANCH_SYMBOL})
-@{SP}
-A=M
-M=-1
-({END_BRANCH_SYMBOL})
-@{SP}
-M=M+1
-""".strip()
+        if cmd.value in COMPARISON_COMMANDS and self._shared_comparisons:
+            return self._gen_comparison_call(cmd.value)
+
+        instructions: List[Instruction] = [
+            Comment(cmd.value),
+            *_POP_D,
+            AInstruction(SP),
+            CInstruction('M', 'M-1'),
+            CInstruction('A', 'M'),
+        ]
+
+        if cmd.value in _COMPARISON_JUMPS:
+            TRUE_BRANCH_SYMBOL = self._gen_label(f'{cmd.value.upper()}_TRUE')
+            END_BRANCH_SYMBOL = self._gen_label(f'{cmd.value.upper()}_END')
+            instructions.extend([
+                CInstruction('D', 'M-D'),
+                AInstruction(TRUE_BRANCH_SYMBOL),
+                CInstruction(None, 'D', _COMPARISON_JUMPS[cmd.value]),
+                AInstruction(SP),
+                CInstruction('A', 'M'),
+                CInstruction('M', '0'),
+                AInstruction(END_BRANCH_SYMBOL),
+                _JUMP,
+                Label(TRUE_BRANCH_SYMBOL),
+                AInstruction(SP),
+                CInstruction('A', 'M'),
+                CInstruction('M', '-1'),
+                Label(END_BRANCH_SYMBOL),
+                AInstruction(SP),
+                CInstruction('M', 'M+1'),
+            ])
+            return instructions
         # endregion
 
         # region add, sub, and, or
-        al_sym = ''
-        if cmd.value == VMCommand.ADD.value:
-            al_sym = 'M=D+M'
-        elif cmd.value == VMCommand.SUB.value:
-            al_sym = 'M=M-D'
-        elif cmd.value == VMCommand.AND.value:
-            al_sym = 'M=D&M'
-        elif cmd.value == VMCommand.OR.value:
-            al_sym = 'M=D|M'
-
-        return f"""
-{asm_code}
-{al_sym}
-@{SP}
-M=M+1
-""".strip()
+        instructions.extend([
+            CInstruction('M', _BINARY_COMPS[cmd.value]),
+            AInstruction(SP),
+            CInstruction('M', 'M+1'),
+        ])
+        return instructions
      # endregion
      # endregion
 
-    def _visit_StackCmdNode(self, node: StackCmdNode) -> str:
+    def _visit_StackCmdNode(self, node: StackCmdNode) -> List[Instruction]:
         cmd = node.cmd
         if cmd.value == VMCommand.PUSH.value:
             return self._gen_asm_for_push_cmd(node)
         elif cmd.value == VMCommand.POP.value:
             return self._gen_asm_for_pop_cmd(node)
 
-    def _gen_asm_for_push_cmd(self, node: StackCmdNode) -> str:
+    @staticmethod
+    def _segment_pointer(segment: str) -> str:
+        if segment == VMMemorySegment.THIS.value:
+            return THIS
+        if segment == VMMemorySegment.THAT.value:
+            return THAT
+        if segment == VMMemorySegment.ARGUMENT.value:
+            return ARG
+        return LCL
+
+    @staticmethod
+    def _pointer_register(idx: int) -> str:
+        if idx == 0:
+            return THIS
+        if idx == 1:
+            return THAT
+        raise Error(
+            f'Invalid memory location {idx} for pointer segment')
+
+    def _gen_asm_for_push_cmd(self, node: StackCmdNode) -> List[Instruction]:
         cmd = node.cmd
         segment_node = node.segment
+        segment = segment_node.segment.value
+        idx = segment_node.idx.value
 
-        comment_code = f"// {cmd.value} {segment_node.segment.value} {segment_node.idx.value}".strip()
-        base_push_asm_code = f"""
-@{SP}
-A=M
-M=D
-@{SP}
-M=M+1
-""".strip()
-
-        if segment_node.segment.value == VMMemorySegment.STATIC.value:
-            return f"""
-{comment_code}
-@{segment_node.idx.value}
-D=M
-{base_push_asm_code}
-""".strip()
-        if segment_node.segment.value == VMMemorySegment.CONSTANT.value:
-            return f"""
-{comment_code}
-@{segment_node.idx.value}
-D=A
-{base_push_asm_code}
-""".strip()
-        if segment_node.segment.value in [VMMemorySegment.ARGUMENT.value, VMMemorySegment.LOCAL.value, VMMemorySegment.THIS.value, VMMemorySegment.THAT.value]:
-            ptr = ''
-            if segment_node.segment.value == VMMemorySegment.THIS.value:
-                ptr = THIS
-            elif segment_node.segment.value == VMMemorySegment.THAT.value:
-                ptr = THAT
-            elif segment_node.segment.value == VMMemorySegment.ARGUMENT.value:
-                ptr = ARG
-            elif segment_node.segment.value == VMMemorySegment.LOCAL.value:
-                ptr = LCL
-
-            return f"""
-{comment_code}
-@{ptr}
-D=M
-@{segment_node.idx.value}
-D=D+A
-A=D
-D=M
-{base_push_asm_code}
-""".strip()
-        if segment_node.segment.value == VMMemorySegment.POINTER.value:
-            ptr = ''
-            if segment_node.idx.value == 0:
-                ptr = THIS
-            elif segment_node.idx.value == 1:
-                ptr = THAT
-            else:
-                raise Error(
-                    f'Invalid memory location {segment_node.idx.value} for pointer segment')
-
-            return f"""
-{comment_code}
-@{ptr}
-D=M
-{base_push_asm_code}
-""".strip()
-        if segment_node.segment.value == VMMemorySegment.TEMP.value:
-            ptr = f'R{segment_node.idx.value+5}'
-            return f"""
-{comment_code}
-@{ptr}
-D=M
-{base_push_asm_code}
-""".strip()
+        comment = Comment(f'{cmd.value} {segment} {idx}')
+
+        if segment == VMMemorySegment.STATIC.value:
+            return [comment, AInstruction(self._static_symbol(idx)), CInstruction('D', 'M'), *_PUSH_D]
+        if segment == VMMemorySegment.CONSTANT.value:
+            return [comment, AInstruction(idx), CInstruction('D', 'A'), *_PUSH_D]
+        if segment in [VMMemorySegment.ARGUMENT.value, VMMemorySegment.LOCAL.value, VMMemorySegment.THIS.value, VMMemorySegment.THAT.value]:
+            return [
+                comment,
+                AInstruction(self._segment_pointer(segment)),
+                CInstruction('D', 'M'),
+                AInstruction(idx),
+                CInstruction('D', 'D+A'),
+                CInstruction('A', 'D'),
+                CInstruction('D', 'M'),
+                *_PUSH_D,
+            ]
+        if segment == VMMemorySegment.POINTER.value:
+            return [comment, AInstruction(self._pointer_register(idx)), CInstruction('D', 'M'), *_PUSH_D]
+        if segment == VMMemorySegment.TEMP.value:
+            return [comment, AInstruction(f'R{idx + 5}'), CInstruction('D', 'M'), *_PUSH_D]
         else:
             raise Error(
-                f'Invalid memory segment {segment_node.segment.value} for stack command `push`')
+                f'Invalid memory segment {segment} for stack command `push`')
 
-    def _gen_asm_for_pop_cmd(self, node: StackCmdNode) -> str:
+    def _gen_asm_for_pop_cmd(self, node: StackCmdNode) -> List[Instruction]:
         cmd = node.cmd
         segment_node = node.segment
+        segment = segment_node.segment.value
+        idx = segment_node.idx.value
+
+        comment = Comment(f'{cmd.value} {segment} {idx}')
 
-        comment_code = f"// {cmd.value} {segment_node.segment.value} {segment_node.idx.value}".strip()
-        base_pop_asm_code = f"""
-@{SP}
-M=M-1
-A=M
-D=M
-""".strip()
-
-        if segment_node.segment.value == VMMemorySegment.STATIC.value:
-            return f"""
-{comment_code}
-{base_pop_asm_code}
-@{segment_node.idx.value}
-M=D
-""".strip()
-        if segment_node.segment.value in [VMMemorySegment.ARGUMENT.value, VMMemorySegment.LOCAL.value, VMMemorySegment.THIS.value, VMMemorySegment.THAT.value]:
-            ptr = ''
-            if segment_node.segment.value == VMMemorySegment.THIS.value:
-                ptr = THIS
-            elif segment_node.segment.value == VMMemorySegment.THAT.value:
-                ptr = THAT
-            elif segment_node.segment.value == VMMemorySegment.ARGUMENT.value:
-                ptr = ARG
-            elif segment_node.segment.value == VMMemorySegment.LOCAL.value:
-                ptr = LCL
-
-            return f"""
-{comment_code}
-@{segment_node.idx.value}
-D=A
-@{ptr}
-D=D+M
-@R13
-M=D
-{base_pop_asm_code}
-@R13
-A=M
-M=D
-""".strip()
-        if segment_node.segment.value == VMMemorySegment.POINTER.value:
-            ptr = ''
-            if segment_node.idx.value == 0:
-                ptr = THIS
-            elif segment_node.idx.value == 1:
-                ptr = THAT
-            else:
-                raise Error(
-                    f'Invalid memory location {segment_node.idx.value} for pointer segment')
-
-            return f"""
-{comment_code}
-{base_pop_asm_code}
-@{ptr}
-M=D
-""".strip()
-        if segment_node.segment.value == VMMemorySegment.TEMP.value:
-            ptr = f'R{segment_node.idx.value+5}'
-            return f"""
-{comment_code}
-{base_pop_asm_code}
-@{ptr}
-M=D
-""".strip()
+        if segment == VMMemorySegment.STATIC.value:
+            return [comment, *_POP_D, AInstruction(self._static_symbol(idx)), CInstruction('M', 'D')]
+        if segment in [VMMemorySegment.ARGUMENT.value, VMMemorySegment.LOCAL.value, VMMemorySegment.THIS.value, VMMemorySegment.THAT.value]:
+            return [
+                comment,
+                AInstruction(idx),
+                CInstruction('D', 'A'),
+                AInstruction(self._segment_pointer(segment)),
+                CInstruction('D', 'D+M'),
+                AInstruction('R13'),
+                CInstruction('M', 'D'),
+                *_POP_D,
+                AInstruction('R13'),
+                CInstruction('A', 'M'),
+                CInstruction('M', 'D'),
+            ]
+        if segment == VMMemorySegment.POINTER.value:
+            return [comment, *_POP_D, AInstruction(self._pointer_register(idx)), CInstruction('M', 'D')]
+        if segment == VMMemorySegment.TEMP.value:
+            return [comment, *_POP_D, AInstruction(f'R{idx + 5}'), CInstruction('M', 'D')]
         else:
             raise Error(
-                f'Invalid memory segment {segment_node.segment.value} for stack command `pop`')
+                f'Invalid memory segment {segment} for stack command `pop`')
 # endregion
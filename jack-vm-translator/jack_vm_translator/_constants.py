@@ -10,10 +10,15 @@ THIS: str = 'THIS'
 THAT: str = 'THAT'
 
 STACK_BASE_ADDRESS: int = 256
+STATIC_BASE_ADDRESS: int = 16
 TEMP_BASE_ADDRESS: int = 15
 
 TEMP_SEGMENT_MAX_SIZE: int = 8
 POINTER_SEGMENT_MAX_SIZE: int = 2
+STATIC_SEGMENT_MAX_SIZE: int = STACK_BASE_ADDRESS - STATIC_BASE_ADDRESS
+
+PREDEFINED_SYMBOLS: Set[str] = {SP, LCL, ARG, THIS, THAT, 'SCREEN', 'KBD', *(f'R{i}' for i in range(16))}
+"""Symbols the Hack assembler defines by itself"""
 
 
 class VMCommand(Enum):
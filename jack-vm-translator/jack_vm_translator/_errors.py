@@ -19,6 +19,10 @@ class ParserError(Error):
     pass
 
 
+class LinkerError(Error):
+    pass
+
+
 class UnexpectedTokenError(ParserError):
     def __init__(self, token: Token, expected: Optional[Union[TokenType, List[TokenType]]] = None):
         message = ''
@@ -0,0 +1,149 @@
+from functools import partial
+from operator import attrgetter
+from typing import Dict, Iterable, Optional, Tuple, Union
+from weakref import ref
+
+
+class Instruction(object):
+    """
+    Line of Hack assembly generated by the vm translator.
+
+    Instructions are interned: building the same instruction twice gives
+    the same object, so they compare by identity, code generators share
+    them freely and pickling a program sends each distinct instruction
+    once. They must never be mutated.
+
+    The intern tables only keep weak references: an instruction that no
+    program uses anymore is freed, so the tables do not grow with every
+    translation a long-lived process runs.
+    """
+    __slots__ = ('line', '__weakref__')
+
+    line: str
+    """Assembly text of the instruction, formatted once when it is created"""
+
+    _interned: Dict[object, ref] = {}
+    """Weak reference to the live instance of each distinct instruction, per instruction class"""
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._interned = {}
+
+    @classmethod
+    def _intern(cls, key: object) -> 'Instruction':
+        """
+        New instance of the class, interned under **key** until it is freed
+        """
+        instruction = object.__new__(cls)
+        cls._interned[key] = ref(instruction, partial(_forget, cls._interned, key))
+        return instruction
+
+    def __reduce__(self) -> Tuple:
+        return type(self), tuple(getattr(self, name) for name in self.__slots__)
+
+    def __str__(self) -> str:
+        return self.line
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.line!r})'
+
+
+class AInstruction(Instruction):
+    __slots__ = ('value',)
+
+    value: Union[int, str]
+    """Number or symbol loaded into A"""
+
+    def __new__(cls, value: Union[int, str]) -> 'AInstruction':
+        try:
+            instruction = cls._interned[value]()
+            if instruction is not None:
+                return instruction
+        except KeyError:
+            pass
+        instruction = cls._intern(value)
+        instruction.value = value
+        instruction.line = f'@{value}'
+        return instruction
+
+
+class CInstruction(Instruction):
+    __slots__ = ('dest', 'comp', 'jump')
+
+    dest: Optional[str]
+    comp: str
+    jump: Optional[str]
+
+    def __new__(cls, dest: Optional[str], comp: str, jump: Optional[str] = None) -> 'CInstruction':
+        key = (dest, comp, jump)
+        try:
+            instruction = cls._interned[key]()
+            if instruction is not None:
+                return instruction
+        except KeyError:
+            pass
+        instruction = cls._intern(key)
+        instruction.dest, instruction.comp, instruction.jump = key
+        instruction.line = f'{f"{dest}=" if dest else ""}{comp}{f";{jump}" if jump else ""}'
+        return instruction
+
+
+class Label(Instruction):
+    __slots__ = ('name',)
+
+    name: str
+
+    def __new__(cls, name: str) -> 'Label':
+        try:
+            instruction = cls._interned[name]()
+            if instruction is not None:
+                return instruction
+        except KeyError:
+            pass
+        instruction = cls._intern(name)
+        instruction.name = name
+        instruction.line = f'({name})'
+        return instruction
+
+
+class Comment(Instruction):
+    __slots__ = ('text',)
+
+    text: str
+
+    def __new__(cls, text: str) -> 'Comment':
+        try:
+            instruction = cls._interned[text]()
+            if instruction is not None:
+                return instruction
+        except KeyError:
+            pass
+        instruction = cls._intern(text)
+        instruction.text = text
+        instruction.line = f'// {text}'
+        return instruction
+
+
+def _forget(table: Dict[object, ref], key: object, reference: ref) -> None:
+    """
+    Remove a freed instruction from its intern table
+    """
+    if table.get(key) is reference:
+        del table[key]
+
+
+_LINE = attrgetter('line')
+
+
+def count_instructions(instructions: Iterable[Instruction]) -> int:
+    """
+    Count the Hack instructions, ignoring comments and labels
+    """
+    return sum(1 for instruction in instructions if isinstance(instruction, (AInstruction, CInstruction)))
+
+
+def to_asm_code(instructions: Iterable[Instruction]) -> str:
+    """
+    Hack assembly text of **instructions**, one per line
+    """
+    return '\n'.join(map(_LINE, instructions))
@@ -3,6 +3,8 @@ from _token import Token, TokenType
 from _errors import LexerError
 from _utils import is_vm_command_keyword, is_vm_segment_keyword
 
+SYMBOL_SPECIAL_CHARS = '_.:'
+
 
 class Lexer(object):
     def __init__(self, text: str):
@@ -62,11 +64,20 @@ class Lexer(object):
                      line=line,
                      column=column)
 
+    def _is_symbol_char(self, char: str) -> bool:
+        """
+        Test if **char** can be part of a symbol: letters, digits, `_`, `.` and `:`
+        """
+        return char.isalnum() or char in SYMBOL_SPECIAL_CHARS
+
     def _symbol(self) -> Token:
         line = self._current_line
         column = self._current_column
         char = ''
-        while self._current_char is not None and self._current_char.isalpha():
+        while self._current_char is not None and (
+                self._is_symbol_char(self._current_char)
+                # `if-goto` is the only keyword containing a dash
+                or (self._current_char == '-' and char == 'if')):
             char += self._current_char
             self._advance()
 
@@ -125,7 +136,7 @@ class Lexer(object):
             if self._current_char.isdecimal():
                 return self._integer()
 
-            if self._current_char.isalpha():
+            if self._current_char.isalpha() or self._current_char in SYMBOL_SPECIAL_CHARS:
                 return self._symbol()
 
             raise LexerError(
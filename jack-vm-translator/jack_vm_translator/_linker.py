@@ -0,0 +1,124 @@
+from typing import Dict, List, Set
+from _code_gen import CALL_ROUTINE_SYMBOL, gen_routines, prepend_routines, static_symbol
+from _constants import SP, STACK_BASE_ADDRESS, STATIC_BASE_ADDRESS, STATIC_SEGMENT_MAX_SIZE, PREDEFINED_SYMBOLS
+from _errors import LinkerError
+from _instruction import Instruction, AInstruction, CInstruction, Label, Comment
+from _translator import Translation
+
+ENTRY_FUNCTION = 'Sys.init'
+"""Function called by the bootstrap code"""
+HALT_SYMBOL = 'VM$HALT'
+"""Endless loop reached if the entry function ever returns"""
+
+
+def gen_bootstrap() -> List[Instruction]:
+    """
+    Set SP to the stack base and call the entry function without argument
+    """
+    return [
+        Comment('bootstrap'),
+        AInstruction(STACK_BASE_ADDRESS),
+        CInstruction('D', 'A'),
+        AInstruction(SP),
+        CInstruction('M', 'D'),
+        AInstruction('R14'),
+        CInstruction('M', '0'),
+        AInstruction(ENTRY_FUNCTION),
+        CInstruction('D', 'A'),
+        AInstruction('R13'),
+        CInstruction('M', 'D'),
+        AInstruction(HALT_SYMBOL),
+        CInstruction('D', 'A'),
+        AInstruction(CALL_ROUTINE_SYMBOL),
+        CInstruction(None, '0', 'JMP'),
+        Label(HALT_SYMBOL),
+        AInstruction(HALT_SYMBOL),
+        CInstruction(None, '0', 'JMP'),
+    ]
+
+
+def allocate_statics(translations: List[Translation]) -> Dict[str, int]:
+    """
+    Base address of the static segment of each file, the segments being
+    laid out one after another from `STATIC_BASE_ADDRESS` in link order
+    """
+    bases: Dict[str, int] = {}
+    address = STATIC_BASE_ADDRESS
+    for translation in translations:
+        bases[translation.file_name] = address
+        address += translation.static_count
+
+    size = address - STATIC_BASE_ADDRESS
+    if size > STATIC_SEGMENT_MAX_SIZE:
+        raise LinkerError(f'Static variables need {size} words, only {STATIC_SEGMENT_MAX_SIZE} are available')
+    return bases
+
+
+def static_usage_report(translations: List[Translation], bases: Dict[str, int]) -> List[str]:
+    """
+    Lines describing where the static segment of each file lies
+    """
+    lines: List[str] = []
+    total = 0
+    for translation in translations:
+        count = translation.static_count
+        total += count
+        if count:
+            base = bases[translation.file_name]
+            lines.append(f'{translation.file_name}: {count} statics at RAM[{base}..{base + count - 1}]')
+    lines.append(f'statics: {total} of {STATIC_SEGMENT_MAX_SIZE} words '
+                 f'({total / STATIC_SEGMENT_MAX_SIZE * 100:.1f}%)')
+    return lines
+
+
+def _resolve_addresses(instructions: List[Instruction],
+                       translations: List[Translation],
+                       bases: Dict[str, int]) -> List[Instruction]:
+    """
+    Replace the static symbols of each file by their address in its
+    segment. The assembler allocates any other undeclared symbol, such as
+    a call to a function no file defines, from RAM[16] where it would
+    alias a static: it gets the next address after the static segments
+    instead, in order of first use.
+    """
+    addresses = {static_symbol(translation.file_name, idx): bases[translation.file_name] + idx
+                 for translation in translations for idx in range(translation.static_count)}
+    address = STATIC_BASE_ADDRESS + sum(translation.static_count for translation in translations)
+
+    # Instructions are interned: each distinct one is looked at once, in order of first use
+    distinct = dict.fromkeys(instructions)
+    labels = {instruction.name for instruction in distinct if isinstance(instruction, Label)}
+    replacements: Dict[Instruction, Instruction] = {}
+    for instruction in distinct:
+        if isinstance(instruction, AInstruction) and isinstance(instruction.value, str):
+            name = instruction.value
+            if name not in addresses and name not in labels and name not in PREDEFINED_SYMBOLS:
+                addresses[name] = address
+                address += 1
+            if name in addresses:
+                replacements[instruction] = AInstruction(addresses[name])
+    if not replacements:
+        return instructions
+    return [replacements.get(instruction, instruction) for instruction in instructions]
+
+
+def link(translations: List[Translation], bootstrap: bool = True) -> List[Instruction]:
+    """
+    Join translated files into one program, each shared routine they call
+    being emitted once. The files are linked in the order they are given,
+    their static variables being allocated the same way.
+
+    With **bootstrap**, the program starts by calling the entry function,
+    the shared routines lying between the bootstrap code and the files.
+    """
+    bases = allocate_statics(translations)
+    used_routines: Set[str] = set()
+    for translation in translations:
+        used_routines.update(translation.used_routines)
+    instructions = [instruction for translation in translations for instruction in translation.instructions]
+
+    if not bootstrap:
+        return _resolve_addresses(prepend_routines(instructions, used_routines), translations, bases)
+
+    used_routines.add(CALL_ROUTINE_SYMBOL)
+    return _resolve_addresses([*gen_bootstrap(), *gen_routines(used_routines), *instructions], translations, bases)
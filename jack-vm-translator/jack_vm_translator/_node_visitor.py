@@ -1,13 +1,37 @@
 from abc import ABC
+from typing import Any, Callable, Dict, Iterable, Iterator
 from _errors import Error
 from _ast_ import AstNode
 
+Visitor = Callable[[Any, AstNode], Any]
+
 
 class NodeVisitor(ABC):
+    _visitors: Dict[type, Visitor] = {}
+    """Visit method of each node type, resolved once per visitor class"""
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._visitors = {}
+
+    @classmethod
+    def _resolve_visitor(cls, node_type: type) -> Visitor:
+        visitor = getattr(cls, f'_visit_{node_type.__name__}', cls._generic_visit)
+        cls._visitors[node_type] = visitor
+        return visitor
+
     def _visit(self, node: AstNode):
-        visitor = getattr(
-            self, f'_visit_{type(node).__name__}', self._generic_visit)
-        return visitor(node)
+        visitor = self._visitors.get(type(node)) or self._resolve_visitor(type(node))
+        return visitor(self, node)
+
+    def _visit_all(self, nodes: Iterable[AstNode]) -> Iterator:
+        """
+        Lazily visit each of **nodes**, yielding the result of each visit
+        """
+        visitors = self._visitors
+        for node in nodes:
+            visitor = visitors.get(type(node)) or self._resolve_visitor(type(node))
+            yield visitor(self, node)
 
     def _generic_visit(self, node: AstNode):
-        raise Error(f'No visit method found for {type(node).__name__}')
\ No newline at end of file
+        raise Error(f'No visit method found for {type(node).__name__}')
\ No newline at end of file
@@ -0,0 +1,200 @@
+from typing import Dict, List, Optional, Set, Tuple, Union
+from _ast_ import ProgramNode, AstNode, StackCmdNode, MemSegmentNode, ArithLogicCmdNode
+from _constants import VMCommand, VMMemorySegment, SP, LCL, ARG, THIS, THAT
+from _instruction import Instruction, AInstruction, CInstruction, Label
+from _token import Token
+
+
+MAX_CONSTANT: int = 32767
+"""Biggest value of a `push constant` command"""
+
+_FOLDABLE_COMMANDS = {
+    VMCommand.ADD.value: lambda x, y: x + y,
+    VMCommand.SUB.value: lambda x, y: x - y,
+    VMCommand.AND.value: lambda x, y: x & y,
+    VMCommand.OR.value: lambda x, y: x | y,
+}
+
+_PREDEFINED_ADDRESSES: Dict[str, int] = {
+    SP: 0, LCL: 1, ARG: 2, THIS: 3, THAT: 4,
+    **{f'R{i}': i for i in range(16)},
+    'SCREEN': 16384,
+    'KBD': 24576,
+}
+
+
+def _push_constant(node: AstNode) -> Optional[int]:
+    if isinstance(node, StackCmdNode) \
+            and node.cmd.value == VMCommand.PUSH.value \
+            and node.segment.segment.value == VMMemorySegment.CONSTANT.value:
+        return node.segment.idx.value
+    return None
+
+
+def fold_constants(ast: ProgramNode) -> ProgramNode:
+    """
+    Replace `push constant x`, `push constant y`, `add|sub|and|or` by a
+    single `push constant` of the result, as long as the result is itself
+    a valid constant.
+
+    Folding is done on the VM commands rather than on the generated
+    assembly, where both operands are already spilled to the stack.
+    """
+    commands: List[AstNode] = []
+    for node in ast.commands:
+        if isinstance(node, ArithLogicCmdNode) and node.cmd.value in _FOLDABLE_COMMANDS and len(commands) >= 2:
+            x = _push_constant(commands[-2])
+            y = _push_constant(commands[-1])
+            if x is not None and y is not None:
+                result = _FOLDABLE_COMMANDS[node.cmd.value](x, y)
+                if 0 <= result <= MAX_CONSTANT:
+                    first: StackCmdNode = commands[-2]
+                    idx = first.segment.idx
+                    commands[-2:] = [StackCmdNode(
+                        cmd=first.cmd,
+                        segment=MemSegmentNode(segment=first.segment.segment,
+                                               idx=Token(type=idx.type, value=result, line=idx.line, column=idx.column)))]
+                    continue
+        commands.append(node)
+    return ProgramNode(commands=commands)
+
+
+Address = Union[int, str]
+"""Address held by the A register: an integer for numbers and predefined symbols, the name otherwise"""
+
+AValue = Optional[Tuple[str, Address]]
+"""Known content of the A register, `('addr', x)` for x itself or `('deref', x)` for RAM[x]"""
+
+_CANCELLED_BY: Dict[str, CInstruction] = {
+    'M-1': CInstruction('M', 'M+1'),
+    'M+1': CInstruction('M', 'M-1'),
+}
+"""Instruction undone by `M=<comp>` right after it"""
+
+
+class _State(object):
+    __slots__ = ('a', 'd_mem', 'stable')
+
+    def __init__(self, a: AValue = None, d_mem: AValue = None, stable: Optional[Set[Address]] = None):
+        self.a = a
+        """What A holds"""
+        self.d_mem = d_mem
+        """Value of A for which RAM[A] is known to be equal to D"""
+        self.stable: Set[Address] = stable if stable is not None else set()
+        """Addresses whose RAM content did not change since it was last loaded into A"""
+
+    def copy(self) -> '_State':
+        return _State(a=self.a, d_mem=self.d_mem, stable=set(self.stable))
+
+
+class PeepholeOptimizer(object):
+    """
+    Remove redundant instructions from the Hack assembly generated by
+    `CodeGenerator`, following what A and D hold within each straight
+    line sequence of instructions (state is forgotten at every label).
+
+    - `@X` is dropped when A already holds X, which merges consecutive
+      SP adjustments under a single `@SP`.
+    - `M=M+1` directly followed by `M=M-1` on the same address (a push
+      followed by a pop) cancels out.
+    - `@X`, `A=M` is dropped when A already holds RAM[X] and RAM[X] did
+      not change since.
+    - `D=M` is dropped when D already holds RAM[A].
+
+    Pointer-based accesses (stack, segments) are assumed never to hit the
+    pointer registers themselves (RAM[0..15]).
+    """
+
+    def __init__(self, instructions: List[Instruction]):
+        self._instructions = instructions
+
+        self._output: List[Optional[Instruction]] = []
+        self._emitted: List[Tuple[int, _State]] = []
+        """Output index and state before each emitted instruction since the last label"""
+        self._state = _State()
+
+    def optimize(self) -> List[Instruction]:
+        for instruction in self._instructions:
+            if isinstance(instruction, AInstruction):
+                self._a_instruction(instruction)
+            elif isinstance(instruction, CInstruction):
+                self._c_instruction(instruction)
+            else:
+                self._output.append(instruction)
+                if isinstance(instruction, Label):
+                    self._emitted.clear()
+                    self._state = _State()
+
+        return [instruction for instruction in self._output if instruction is not None]
+
+    def _emit(self, instruction: Instruction) -> None:
+        self._emitted.append((len(self._output), self._state.copy()))
+        self._output.append(instruction)
+
+    def _previous(self) -> Optional[Instruction]:
+        if not self._emitted:
+            return None
+        return self._output[self._emitted[-1][0]]
+
+    def _drop_previous(self) -> None:
+        """
+        Remove the last emitted instruction and go back to the state before it
+        """
+        index, state = self._emitted.pop()
+        self._output[index] = None
+        self._state = state
+
+    @staticmethod
+    def _address(value: Union[int, str]) -> Address:
+        if isinstance(value, int):
+            return value
+        return _PREDEFINED_ADDRESSES.get(value, value)
+
+    def _a_instruction(self, instruction: AInstruction) -> None:
+        a = ('addr', self._address(instruction.value))
+        if self._state.a == a:
+            return
+        self._emit(instruction)
+        self._state.a = a
+
+    def _c_instruction(self, instruction: CInstruction) -> None:
+        dest = instruction.dest or ''
+        comp = instruction.comp
+        jump = instruction.jump
+        state = self._state
+        a = state.a
+
+        if not jump:
+            if dest == 'A' and comp == 'M' and a is not None and a[0] == 'addr' and self._emitted:
+                previous_state = self._emitted[-1][1]
+                if isinstance(self._previous(), AInstruction) \
+                        and previous_state.a == ('deref', a[1]) \
+                        and a[1] in previous_state.stable:
+                    # `@X`, `A=M` while A already held RAM[X]
+                    self._drop_previous()
+                    return
+
+            if dest == 'D' and comp == 'M' and a is not None and state.d_mem == a:
+                return
+
+            if dest == 'M' and comp in _CANCELLED_BY and self._previous() == _CANCELLED_BY[comp]:
+                self._drop_previous()
+                return
+
+        self._emit(instruction)
+
+        if 'M' in dest:
+            if a is None:
+                state.stable.clear()
+            elif a[0] == 'addr':
+                state.stable.discard(a[1])
+            state.d_mem = a if comp == 'D' or 'D' in dest else None
+        elif 'D' in dest:
+            state.d_mem = a if comp == 'M' else None
+
+        if 'A' in dest:
+            if comp == 'M' and 'M' not in dest and a is not None and a[0] == 'addr':
+                state.a = ('deref', a[1])
+                state.stable.add(a[1])
+            else:
+                state.a = None
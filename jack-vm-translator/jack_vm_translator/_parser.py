@@ -1,9 +1,11 @@
 from typing import List
 from _token import Token, TokenType
 from _lexer import Lexer
-from _ast_ import ProgramNode, CmdNode, StackCmdNode, MemSegmentNode, ArithLogicCmdNode
+from _ast_ import ProgramNode, CmdNode, StackCmdNode, MemSegmentNode, ArithLogicCmdNode, \
+    FlowCmdNode, FunctionCmdNode, CallCmdNode, ReturnCmdNode
+from _constants import VMCommand
 from _errors import UnexpectedTokenError
-from _utils import is_stack_cmd_keyword, is_arith_logic_cmd_keyword
+from _utils import is_stack_cmd_keyword, is_arith_logic_cmd_keyword, is_flow_cmd_keyword
 
 
 class Parser(object):
@@ -18,18 +20,18 @@ class Parser(object):
         cmds: List[CmdNode] = []
 
         while self._current_token.type != TokenType.EOF:
-            self._eat(TokenType.EOL)
             if self._current_token.type == TokenType.EOL:
-                continue
-            if self._current_token.type == TokenType.EOF:
+                self._eat(TokenType.EOL)
                 continue
             if self._current_token.type == TokenType.COMMAND:
                 cmds.append(self._cmd())
+                # One command per line
+                if self._current_token.type != TokenType.EOF:
+                    self._eat(TokenType.EOL)
             else:
                 raise UnexpectedTokenError(
                     token=self._current_token,
-                    expected=[TokenType.LPAREN,
-                              TokenType.AT_SIGN, TokenType.MNEMONIC]
+                    expected=TokenType.COMMAND
                 )
 
         self._eat(TokenType.EOF)
@@ -42,12 +44,47 @@ class Parser(object):
             cmd = self._current_token
             self._eat(TokenType.COMMAND)
             return ArithLogicCmdNode(cmd=cmd)
+        elif is_flow_cmd_keyword(self._current_token.value):
+            return self._flow_cmd()
+        elif self._current_token.value == VMCommand.FUNCTION.value:
+            return self._function_cmd()
+        elif self._current_token.value == VMCommand.CALL.value:
+            return self._call_cmd()
+        else:
+            cmd = self._current_token
+            self._eat(TokenType.COMMAND)
+            return ReturnCmdNode(cmd=cmd)
 
     def _stack_cmd(self) -> StackCmdNode:
         cmd = self._current_token
         self._eat(TokenType.COMMAND)
         return StackCmdNode(cmd=cmd, segment=self._segment())
 
+    def _flow_cmd(self) -> FlowCmdNode:
+        cmd = self._current_token
+        self._eat(TokenType.COMMAND)
+        label_token = self._current_token
+        self._eat(TokenType.SYMBOL)
+        return FlowCmdNode(cmd=cmd, label=label_token)
+
+    def _function_cmd(self) -> FunctionCmdNode:
+        cmd = self._current_token
+        self._eat(TokenType.COMMAND)
+        name_token = self._current_token
+        self._eat(TokenType.SYMBOL)
+        n_vars_token = self._current_token
+        self._eat(TokenType.INTEGER)
+        return FunctionCmdNode(cmd=cmd, name=name_token, n_vars=n_vars_token)
+
+    def _call_cmd(self) -> CallCmdNode:
+        cmd = self._current_token
+        self._eat(TokenType.COMMAND)
+        name_token = self._current_token
+        self._eat(TokenType.SYMBOL)
+        n_args_token = self._current_token
+        self._eat(TokenType.INTEGER)
+        return CallCmdNode(cmd=cmd, name=name_token, n_args=n_args_token)
+
     def _segment(self) -> MemSegmentNode:
         segment_token = self._current_token
         self._eat(TokenType.MEMORY_SEGMENT)
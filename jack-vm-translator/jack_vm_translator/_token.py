@@ -14,6 +14,8 @@ class TokenType(Enum):
 
 
 class Token(object):
+    __slots__ = ('type', 'value', 'line', 'column')
+
     def __init__(self,
                  type: TokenType,
                  value: Optional[Union[int, str]] = None,
@@ -0,0 +1,252 @@
+from typing import List, Tuple
+from _ast_ import ProgramNode, ArithLogicCmdNode, StackCmdNode, MemSegmentNode, FlowCmdNode, FunctionCmdNode, \
+    CallCmdNode, ReturnCmdNode
+from _code_gen import CodeGenerator, COMPARISON_COMMANDS
+from _constants import VMCommand, VMMemorySegment, SP, THIS, THAT, ARG, LCL
+from _errors import Error
+from _instruction import Instruction, AInstruction, CInstruction, Label, Comment
+
+_SEGMENT_POINTERS = {
+    VMMemorySegment.ARGUMENT.value: ARG,
+    VMMemorySegment.LOCAL.value: LCL,
+    VMMemorySegment.THIS.value: THIS,
+    VMMemorySegment.THAT.value: THAT,
+}
+
+_BINARY_COMPS = {
+    VMCommand.ADD.value: 'D+M',
+    VMCommand.SUB.value: 'M-D',
+    VMCommand.AND.value: 'D&M',
+    VMCommand.OR.value: 'D|M',
+}
+
+_COMPARISON_JUMPS = {
+    VMCommand.EQ.value: 'JEQ',
+    VMCommand.GT.value: 'JGT',
+    VMCommand.LT.value: 'JLT',
+}
+
+MAX_POINTER_CHAIN: int = 10
+"""Biggest segment index popped to by stepping A up from the segment base while D holds the value"""
+MAX_POP_CHAIN: int = 5
+"""Biggest segment index popped to by stepping A when the value is still in RAM"""
+
+
+class TosCodeGenerator(CodeGenerator):
+    """
+    Generate Hack assembly keeping the top of the stack in the D register.
+
+    While the top of stack is cached, it is not stored in RAM and SP
+    points where it would be stored, so consecutive stack commands work
+    on D instead of going through `@SP`, `A=M` for every value. The cache
+    is spilled to RAM wherever the stack must be in memory: at the end of
+    the program and before any label, branch or call.
+    """
+
+    INLINE_COMPARISON_CYCLES: Tuple[int, int] = (6, 8)
+    """Executed instructions of an inline comparison with the top of stack in D, when true and when false"""
+
+    def __init__(self, ast: ProgramNode, file_name: str = '', shared_comparisons: bool = False):
+        super().__init__(ast=ast, file_name=file_name, shared_comparisons=shared_comparisons)
+        self._tos_in_d: bool = False
+        """Whether the top of the stack is held by D instead of RAM"""
+
+    def _spill(self) -> List[Instruction]:
+        """
+        Store the top of the stack back to RAM if D holds it
+        """
+        if not self._tos_in_d:
+            return []
+        self._tos_in_d = False
+        return [
+            AInstruction(SP),
+            CInstruction('AM', 'M+1'),
+            CInstruction('A', 'A-1'),
+            CInstruction('M', 'D'),
+        ]
+
+    def _fill(self) -> List[Instruction]:
+        """
+        Pop the top of the stack into D if it is not there already
+        """
+        if self._tos_in_d:
+            return []
+        self._tos_in_d = True
+        return [
+            AInstruction(SP),
+            CInstruction('AM', 'M-1'),
+            CInstruction('D', 'M'),
+        ]
+
+    @staticmethod
+    def _join(*parts: List[Instruction]) -> List[Instruction]:
+        return [instruction for part in parts for instruction in part]
+
+    def _visit_ProgramNode(self, node: ProgramNode) -> List[Instruction]:
+        return self._join(super()._visit_ProgramNode(node), self._spill())
+
+    def _visit_ArithLogicCmdNode(self, node: ArithLogicCmdNode) -> List[Instruction]:
+        cmd = node.cmd.value
+        comment = [Comment(cmd)]
+
+        if cmd in [VMCommand.NEG.value, VMCommand.NOT.value]:
+            if self._tos_in_d:
+                return self._join(comment, [CInstruction('D', '-D' if cmd == VMCommand.NEG.value else '!D')])
+            self._tos_in_d = True
+            return self._join(comment, [
+                AInstruction(SP),
+                CInstruction('AM', 'M-1'),
+                CInstruction('D', '-M' if cmd == VMCommand.NEG.value else '!M'),
+            ])
+
+        if cmd in COMPARISON_COMMANDS and self._shared_comparisons:
+            return self._join(self._spill(), self._gen_comparison_call(cmd))
+
+        # Top of stack in D, second value popped into M
+        fill = self._fill()
+        pop_second = [
+            AInstruction(SP),
+            CInstruction('AM', 'M-1'),
+        ]
+
+        if cmd in _BINARY_COMPS:
+            return self._join(comment, fill, pop_second, [CInstruction('D', _BINARY_COMPS[cmd])])
+
+        TRUE_BRANCH_SYMBOL = self._gen_label(f'{cmd.upper()}_TRUE')
+        END_BRANCH_SYMBOL = self._gen_label(f'{cmd.upper()}_END')
+        return self._join(comment, fill, pop_second, [
+            CInstruction('D', 'M-D'),
+            AInstruction(TRUE_BRANCH_SYMBOL),
+            CInstruction(None, 'D', _COMPARISON_JUMPS[cmd]),
+            CInstruction('D', '0'),
+            AInstruction(END_BRANCH_SYMBOL),
+            CInstruction(None, '0', 'JMP'),
+            Label(TRUE_BRANCH_SYMBOL),
+            CInstruction('D', '-1'),
+            Label(END_BRANCH_SYMBOL),
+        ])
+
+    def _visit_FlowCmdNode(self, node: FlowCmdNode) -> List[Instruction]:
+        if node.cmd.value != VMCommand.IF_GOTO.value or not self._tos_in_d:
+            return self._join(self._spill(), super()._visit_FlowCmdNode(node))
+
+        # The condition is already in D, the rest of the stack is in RAM
+        self._tos_in_d = False
+        return [
+            Comment(f'{node.cmd.value} {node.label.value}'),
+            AInstruction(self._jump_target(node)),
+            CInstruction(None, 'D', 'JNE'),
+        ]
+
+    def _visit_FunctionCmdNode(self, node: FunctionCmdNode) -> List[Instruction]:
+        return self._join(self._spill(), super()._visit_FunctionCmdNode(node))
+
+    def _visit_CallCmdNode(self, node: CallCmdNode) -> List[Instruction]:
+        return self._join(self._spill(), super()._visit_CallCmdNode(node))
+
+    def _visit_ReturnCmdNode(self, node: ReturnCmdNode) -> List[Instruction]:
+        return self._join(self._spill(), super()._visit_ReturnCmdNode(node))
+
+    def _visit_StackCmdNode(self, node: StackCmdNode) -> List[Instruction]:
+        segment_node = node.segment
+        comment = [Comment(f'{node.cmd.value} {segment_node.segment.value} {segment_node.idx.value}')]
+        if node.cmd.value == VMCommand.PUSH.value:
+            spill = self._spill()
+            self._tos_in_d = True
+            return self._join(comment, spill, self._gen_load(segment_node))
+        elif node.cmd.value == VMCommand.POP.value:
+            return self._join(comment, self._gen_asm_for_pop(segment_node))
+
+    def _register(self, segment_node: MemSegmentNode, cmd: str) -> str:
+        """
+        Register or address backing the static, temp and pointer segments
+        """
+        segment = segment_node.segment.value
+        idx = segment_node.idx.value
+        if segment == VMMemorySegment.STATIC.value:
+            return self._static_symbol(idx)
+        if segment == VMMemorySegment.TEMP.value:
+            return f'R{idx + 5}'
+        if segment == VMMemorySegment.POINTER.value:
+            if idx == 0:
+                return THIS
+            if idx == 1:
+                return THAT
+            raise Error(f'Invalid memory location {idx} for pointer segment')
+        raise Error(f'Invalid memory segment {segment} for stack command `{cmd}`')
+
+    def _gen_load(self, segment_node: MemSegmentNode) -> List[Instruction]:
+        """
+        Load the value of a segment entry into D
+        """
+        segment = segment_node.segment.value
+        idx = segment_node.idx.value
+        if segment == VMMemorySegment.CONSTANT.value:
+            if idx in (0, 1):
+                return [CInstruction('D', str(idx))]
+            return [AInstruction(idx), CInstruction('D', 'A')]
+        if segment in _SEGMENT_POINTERS:
+            ptr = _SEGMENT_POINTERS[segment]
+            if idx == 0:
+                return [AInstruction(ptr), CInstruction('A', 'M'), CInstruction('D', 'M')]
+            if idx == 1:
+                return [AInstruction(ptr), CInstruction('A', 'M+1'), CInstruction('D', 'M')]
+            return [
+                AInstruction(ptr),
+                CInstruction('D', 'M'),
+                AInstruction(idx),
+                CInstruction('A', 'D+A'),
+                CInstruction('D', 'M'),
+            ]
+        return [AInstruction(self._register(segment_node, VMCommand.PUSH.value)), CInstruction('D', 'M')]
+
+    def _gen_asm_for_pop(self, segment_node: MemSegmentNode) -> List[Instruction]:
+        segment = segment_node.segment.value
+        idx = segment_node.idx.value
+        if segment not in _SEGMENT_POINTERS:
+            register = self._register(segment_node, VMCommand.POP.value)
+            fill = self._fill()
+            self._tos_in_d = False
+            return self._join(fill, [AInstruction(register), CInstruction('M', 'D')])
+
+        ptr = _SEGMENT_POINTERS[segment]
+        if not self._tos_in_d and idx > MAX_POP_CHAIN:
+            # Computing the address before popping is shorter than stepping A
+            return [
+                AInstruction(ptr),
+                CInstruction('D', 'M'),
+                AInstruction(idx),
+                CInstruction('D', 'D+A'),
+                AInstruction('R13'),
+                CInstruction('M', 'D'),
+                AInstruction(SP),
+                CInstruction('AM', 'M-1'),
+                CInstruction('D', 'M'),
+                AInstruction('R13'),
+                CInstruction('A', 'M'),
+                CInstruction('M', 'D'),
+            ]
+
+        fill = self._fill()
+        self._tos_in_d = False
+        if idx > MAX_POINTER_CHAIN:
+            return self._join(fill, [
+                AInstruction('R13'),
+                CInstruction('M', 'D'),
+                AInstruction(ptr),
+                CInstruction('D', 'M'),
+                AInstruction(idx),
+                CInstruction('D', 'D+A'),
+                AInstruction('R14'),
+                CInstruction('M', 'D'),
+                AInstruction('R13'),
+                CInstruction('D', 'M'),
+                AInstruction('R14'),
+                CInstruction('A', 'M'),
+                CInstruction('M', 'D'),
+            ])
+
+        instructions: List[Instruction] = [AInstruction(ptr), CInstruction('A', 'M' if idx == 0 else 'M+1')]
+        instructions.extend([CInstruction('A', 'A+1')] * (idx - 1))
+        instructions.append(CInstruction('M', 'D'))
+        return self._join(fill, instructions)
@@ -0,0 +1,106 @@
+from pathlib import Path
+from typing import Dict, List, Type
+from _ast_ import ProgramNode, ArithLogicCmdNode, FunctionCmdNode, StackCmdNode
+from _code_gen import CodeGenerator, COMPARISON_COMMANDS
+from _constants import VMMemorySegment
+from _instruction import Instruction, count_instructions
+from _lexer import Lexer
+from _optimizer import PeepholeOptimizer, fold_constants
+from _parser import Parser
+from _tos_code_gen import TosCodeGenerator
+
+BACKENDS: Dict[str, Type[CodeGenerator]] = {
+    'stack': CodeGenerator,
+    'tos': TosCodeGenerator,
+}
+
+
+class Translation(object):
+    """
+    Assembly translated from one Jack vm file, ready to be linked
+    """
+
+    def __init__(self,
+                 file_name: str,
+                 instructions: List[Instruction],
+                 used_routines: List[str],
+                 functions: List[str],
+                 static_count: int,
+                 reports: List[str]):
+        self.file_name = file_name
+        self.instructions = instructions
+        """Translated commands, without the shared routines they call"""
+        self.used_routines = used_routines
+        self.functions = functions
+        """Functions defined in the file"""
+        self.static_count = static_count
+        """Number of words of the static segment of the file"""
+        self.reports = reports
+        """Lines to print about the translation"""
+
+
+def static_footprint(ast: ProgramNode) -> int:
+    """
+    Number of words needed by the static segment of a file, i.e. one
+    past the highest static index it pushes or pops
+    """
+    footprint = 0
+    for cmd in ast.commands:
+        if isinstance(cmd, StackCmdNode) and cmd.segment.segment.value == VMMemorySegment.STATIC.value:
+            footprint = max(footprint, cmd.segment.idx.value + 1)
+    return footprint
+
+
+def comparison_report(input_file_path: str,
+                      ast: ProgramNode,
+                      file_name: str,
+                      backend: Type[CodeGenerator] = CodeGenerator) -> str:
+    """
+    ROM size and cycle cost of inline versus shared comparison routines
+    """
+    comparisons = sum(1 for cmd in ast.commands
+                      if isinstance(cmd, ArithLogicCmdNode) and cmd.cmd.value in COMPARISON_COMMANDS)
+    inline = count_instructions(backend(ast=ast, file_name=file_name).generate_program())
+    shared = count_instructions(backend(ast=ast, file_name=file_name, shared_comparisons=True).generate_program())
+    extra_cycles = [s - i for s, i in zip(backend.SHARED_COMPARISON_CYCLES, backend.INLINE_COMPARISON_CYCLES)]
+    return (f'{input_file_path}: {comparisons} comparisons, inline {inline} words, shared {shared} words '
+            f'({shared - inline:+d}), {extra_cycles[0]:+d} cycles per true and {extra_cycles[1]:+d} per false comparison')
+
+
+def translate_file(input_file_path: str,
+                   backend_name: str = 'stack',
+                   opt: bool = False,
+                   shared_comparisons: bool = False) -> Translation:
+    """
+    Translate a single Jack vm file. Runs in a worker process when a
+    whole directory is translated, so it only takes and returns plain data.
+    """
+    file_name = Path(input_file_path).stem
+    backend = BACKENDS[backend_name]
+
+    with open(Path(input_file_path).resolve(), "r") as infile:
+        vm_code = infile.read()
+
+    ast = Parser(lexer=Lexer(text=vm_code)).parse()
+    code_ast = fold_constants(ast) if opt else ast
+    code_gen = backend(ast=code_ast, file_name=file_name, shared_comparisons=shared_comparisons)
+    instructions = code_gen.generate_fragment()
+
+    reports: List[str] = []
+    if opt:
+        instructions = PeepholeOptimizer(instructions=instructions).optimize()
+
+        before = count_instructions(
+            backend(ast=ast, file_name=file_name, shared_comparisons=shared_comparisons).generate_fragment())
+        after = count_instructions(instructions)
+        reports.append(f'{input_file_path}: {before} -> {after} instructions '
+                       f'({(before - after) / max(before, 1) * 100:.1f}% fewer)')
+    if shared_comparisons:
+        reports.append(comparison_report(input_file_path, code_ast, file_name, backend))
+
+    return Translation(file_name=file_name,
+                       instructions=instructions,
+                       used_routines=code_gen.used_routines,
+                       functions=[cmd.name.value for cmd in ast.commands if isinstance(cmd, FunctionCmdNode)],
+                       static_count=static_footprint(ast),
+                       reports=reports)
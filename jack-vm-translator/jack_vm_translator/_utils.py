@@ -16,6 +16,10 @@ def is_arith_logic_cmd_keyword(kw: str) -> bool:
     return kw in ARITH_LOGIC_COMMANDS
 
 
+def is_flow_cmd_keyword(kw: str) -> bool:
+    return kw in [VMCommand.LABEL.value, VMCommand.GOTO.value, VMCommand.IF_GOTO.value]
+
+
 def is_vm_segment_keyword(kw: str) -> bool:
     """
     Test if **kw** is a Jack VM memory segment keyword or not
@@ -0,0 +1,91 @@
+import argparse
+import gc
+import random
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, List, Tuple
+from _constants import ARITH_LOGIC_COMMANDS
+from _lexer import Lexer
+from _parser import Parser
+from _token import Token, TokenType
+
+
+def synthetic_program(commands: int, seed: int = 0) -> str:
+    """
+    Generate a Jack vm program of **commands** stack and arithmetic/logic
+    commands, pushing as much as it pops.
+    """
+    rng = random.Random(seed)
+    segments = ['argument', 'local', 'this', 'that']
+    lines: List[str] = ['// Synthetic benchmark program']
+    for i in range(commands):
+        r = rng.random()
+        if r < 0.35:
+            lines.append(f'push constant {rng.randrange(32768)}')
+        elif r < 0.5:
+            lines.append(f'push {rng.choice(segments)} {rng.randrange(16)}')
+        elif r < 0.6:
+            lines.append(f'pop {rng.choice(segments)} {rng.randrange(16)}')
+        elif r < 0.65:
+            lines.append(f'push static {rng.randrange(16)}')
+        elif r < 0.7:
+            lines.append(f'pop temp {rng.randrange(8)}')
+        else:
+            lines.append(rng.choice(sorted(ARITH_LOGIC_COMMANDS)))
+    return '\n'.join(lines)
+
+
+def tokenize(lexer: Lexer) -> List[Token]:
+    tokens: List[Token] = []
+    token = lexer.get_next_token()
+    while token.type != TokenType.EOF:
+        tokens.append(token)
+        token = lexer.get_next_token()
+    tokens.append(token)
+    return tokens
+
+
+def retained_memory(fn: Callable[[], Any]) -> Tuple[Any, int]:
+    """
+    Run **fn** and return its result along with the memory still held by
+    that result once it returned (tracemalloc, garbage collected first).
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure the memory held by tokens and AST nodes of the Jack vm translator.")
+    parser.add_argument("inputs", nargs='*', help="Paths to input files")
+    parser.add_argument("--synthetic", default='100000,1000000',
+                        help="Comma-separated command counts of generated programs, empty to skip")
+    args = parser.parse_args()
+
+    inputs: List[Tuple[str, str]] = [(p, Path(p).read_text()) for p in args.inputs]
+    for size in filter(None, args.synthetic.split(',')):
+        inputs.append((f'synthetic-{int(size)}', synthetic_program(int(size))))
+
+    for name, text in inputs:
+        tokens, tokens_size = retained_memory(lambda: tokenize(Lexer(text=text)))
+        token_count = len(tokens)
+        del tokens
+
+        ast, ast_size = retained_memory(lambda: Parser(lexer=Lexer(text=text)).parse())
+        commands = max(len(ast.commands), 1)
+        del ast
+
+        print(f'{name}')
+        print(f'    tokens {token_count:9d}  {tokens_size / (1024 * 1024):8.2f} MB  '
+              f'{tokens_size / max(token_count, 1):6.1f} B/token  {tokens_size / commands:6.1f} B/cmd')
+        print(f'    ast    {commands:9d}  {ast_size / (1024 * 1024):8.2f} MB  '
+              f'{ast_size / commands:6.1f} B/cmd')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+HACK_ASSEMBLER_PATH = Path(__file__).resolve().parents[2] / 'hack-assembler'
+"""Sibling checkout of the Hack assembler, used when it is not installed"""
+
+try:
+    import hack_assembler  # noqa: F401
+except ModuleNotFoundError:
+    sys.path.append(str(HACK_ASSEMBLER_PATH))
+
+from hack_assembler.ast import AstNode, ProgramNode, AInstructionNode, CInstructionNode, SymbolDeclarationNode
+from hack_assembler.code_generator import CodeGenerator as HackCodeGenerator
+from hack_assembler.encoding import C_INSTRUCTION_TABLE
+from hack_assembler.pipeline import OUTPUT_EXTENSIONS, write_words
+from hack_assembler.semantic_analyzer import SemanticAnalyzer
+from hack_assembler.tokens import Token, TokenType
+from _errors import Error
+from _instruction import Instruction, AInstruction, CInstruction, Label, to_asm_code
+from VMTranslator import add_translation_arguments, translate_from_args
+
+
+class InstructionBuilder(object):
+    """
+    Build the Hack assembler AST straight from the instructions generated
+    by the vm translator, without writing them out as text.
+
+    The generated code repeats the same few instructions over and over,
+    so each distinct instruction is turned into a node only once and the
+    node is shared by all its occurrences (nodes are never mutated by the
+    semantic analyzer nor the code generator).
+    """
+
+    def __init__(self):
+        self._nodes: Dict[Instruction, AstNode] = {}
+
+    def build(self, instructions: Iterable[Instruction]) -> ProgramNode:
+        nodes = self._nodes
+        program: List[AstNode] = []
+        for instruction in instructions:
+            node = nodes.get(instruction)
+            if node is None:
+                node = self._node(instruction)
+                if node is None:
+                    continue
+                nodes[instruction] = node
+            program.append(node)
+        return ProgramNode(instructions=program)
+
+    @staticmethod
+    def _node(instruction: Instruction) -> Optional[AstNode]:
+        if isinstance(instruction, AInstruction):
+            if isinstance(instruction.value, int):
+                return AInstructionNode(token=Token(type=TokenType.INTEGER, value=instruction.value))
+            return AInstructionNode(token=Token(type=TokenType.SYMBOL, value=instruction.value))
+
+        if isinstance(instruction, Label):
+            return SymbolDeclarationNode(token=Token(type=TokenType.SYMBOL, value=instruction.name))
+
+        if isinstance(instruction, CInstruction):
+            if (instruction.dest, instruction.comp, instruction.jump) not in C_INSTRUCTION_TABLE:
+                raise Error(f'Invalid Hack instruction `{instruction}`')
+            return CInstructionNode(
+                comp=Token(type=TokenType.MNEMONIC, value=instruction.comp),
+                dest=Token(type=TokenType.MNEMONIC, value=instruction.dest) if instruction.dest else None,
+                jump=Token(type=TokenType.MNEMONIC, value=instruction.jump) if instruction.jump else None)
+
+        # Comments are left out of the program
+        return None
+
+
+def main() -> None:
+    """
+    Entrypoint
+    """
+    parser = argparse.ArgumentParser(
+        description="Translate Jack vm bytecode and assemble it into Hack machine code in one go.",
+        epilog=f"Needs the hack_assembler package: installed, on PYTHONPATH, or checked out next to "
+               f"this project ({HACK_ASSEMBLER_PATH}).")
+    add_translation_arguments(parser)
+    parser.add_argument("--format", choices=list(OUTPUT_EXTENSIONS), default='text',
+                        help="Output format: textual .hack file (default) or binary ROM image (.bin)")
+    parser.add_argument("--byteorder", choices=['little', 'big'], default='little',
+                        help="Byte order of the words of a binary ROM image")
+    parser.add_argument("--dump-asm", action='store_true',
+                        help="Also write the intermediate assembly next to the output, for debugging")
+    args = parser.parse_args()
+
+    output_path, instructions = translate_from_args(args)
+
+    if args.dump_asm:
+        with open(output_path.with_name(f'{output_path.name}.asm').resolve(), "w") as outfile:
+            outfile.write(to_asm_code(instructions))
+
+    ast = InstructionBuilder().build(instructions)
+    symbol_table = SemanticAnalyzer(ast=ast).analyze()
+    words = HackCodeGenerator(ast=ast, symbol_table=symbol_table).generate_words()
+
+    write_words(words,
+                output_path.with_name(f'{output_path.name}{OUTPUT_EXTENSIONS[args.format]}'),
+                format=args.format,
+                byteorder=args.byteorder)
+
+
+if __name__ == "__main__":
+    main()